@@ -1,5 +1,29 @@
 LLM_ENDPOINT = "http://localhost:11434/api/generate"
 LLM_MODEL = "llama3.2:3b"
+# Stream tokens and stop as soon as a complete intent JSON has been decoded
+LLM_STREAMING = True
+# Upper bound on generated tokens; an intent object needs far fewer
+LLM_NUM_PREDICT = 128
+
+# Keep the model (and its cached prompt prefix) loaded between requests
+LLM_KEEP_ALIVE = "30m"
+# Load the model and evaluate the system prompt once on startup
+LLM_WARMUP = True
+
+# Model call admission control (keep LLM_MAX_IN_FLIGHT at OLLAMA_NUM_PARALLEL)
+LLM_MAX_IN_FLIGHT = 2
+LLM_MAX_QUEUE = 32
+LLM_MAX_QUEUE_WAIT = 30  # seconds; requests expected to wait longer get a 503
+
+# Rule-based intents at or above this confidence skip the LLM
+FAST_PATH_MIN_CONFIDENCE = 0.8
+
+# Cache of LLM intents keyed by normalized message
+INTENT_CACHE_TTL = 24 * 3600  # seconds
+INTENT_CACHE_MAX_ENTRIES = 4096
+# Trigram similarity for near-duplicate messages (e.g. 0.9); None disables it.
+# Directions are compared per origin/destination slot, so a reversed route never matches.
+INTENT_CACHE_SIMILARITY_THRESHOLD = None
 
 MAP_PROVIDER = "osm"  # future: "google"
 
@@ -7,11 +31,155 @@ MAX_RESULTS = 5
 
 # OpenStreetMap / Nominatim
 NOMINATIM_BASE_URL = "https://nominatim.openstreetmap.org"
-OSRM_BASE_URL = "https://router.project-osrm.org"
-PHOTON_BASE_URL = "https://photon.komoot.io/api"
+
+# "public" uses the community demo servers; "local" a self-hosted
+# OSRM (osrm-routed) and Photon deployment with no usage policy to respect.
+MAP_DEPLOYMENT = "public"
+
+MAP_DEPLOYMENTS = {
+    "public": {
+        "osrm_base_url": "https://router.project-osrm.org",
+        "photon_base_url": "https://photon.komoot.io/api",
+        "osrm_secondary_url": None,
+        "photon_secondary_url": None,
+        "throttles": {
+            "photon": {"rate": 1.0, "burst": 3, "max_concurrency": 2, "max_wait": 5.0},
+            "osrm": {"rate": 1.0, "burst": 2, "max_concurrency": 2, "max_wait": 5.0},
+        },
+    },
+    "local": {
+        "osrm_base_url": "http://localhost:5000",
+        "photon_base_url": "http://localhost:2322/api",
+        # Optional second deployment (e.g. another host) used for hedged requests
+        "osrm_secondary_url": None,
+        "photon_secondary_url": None,
+        "throttles": {
+            "photon": {"rate": 200.0, "burst": 50, "max_concurrency": 16, "max_wait": 2.0},
+            "osrm": {"rate": 200.0, "burst": 50, "max_concurrency": 16, "max_wait": 2.0},
+        },
+    },
+}
+
+OSRM_BASE_URL = MAP_DEPLOYMENTS[MAP_DEPLOYMENT]["osrm_base_url"]
+PHOTON_BASE_URL = MAP_DEPLOYMENTS[MAP_DEPLOYMENT]["photon_base_url"]
+OSRM_SECONDARY_URL = MAP_DEPLOYMENTS[MAP_DEPLOYMENT]["osrm_secondary_url"]
+PHOTON_SECONDARY_URL = MAP_DEPLOYMENTS[MAP_DEPLOYMENT]["photon_secondary_url"]
+# The public demo server only serves "driving"
+OSRM_PROFILE = "driving"
+
+# Optional offline place search over a prebuilt POI index
+# (see backend/providers/local_poi.py); None searches Photon only.
+LOCAL_POI_INDEX_PATH = None  # e.g. "data/poi/jakarta"
+LOCAL_POI_SEARCH_RADIUS = 3000  # meters around the resolved location
+
+# Place searches near a location are also answered from results cached for
+# the same query around nearby locations: geohash cells of this precision
+# (6 ~ 1.2 x 0.6 km; None disables it), keeping places within the radius.
+PLACES_PROXIMITY_PRECISION = 6
+PLACES_PROXIMITY_RADIUS = 1000  # meters
+PLACES_PROXIMITY_TTL = 6 * 3600  # seconds
+PLACES_PROXIMITY_MAX_ENTRIES = 4096
+
+# Routes for the HOT_ROUTES_TOP_K most requested origin/destination pairs
+# (requested at least HOT_ROUTES_MIN_REQUESTS times since the previous run)
+# are precomputed in the background and served with no upstream call.
+# HOT_ROUTES_TOP_K = 0 disables it.
+HOT_ROUTES_PATH = "data/hot_routes.sqlite3"
+HOT_ROUTES_TOP_K = 50
+HOT_ROUTES_MIN_REQUESTS = 3
+HOT_ROUTES_REFRESH_INTERVAL = 600  # seconds between background runs
+HOT_ROUTES_REFRESH_AFTER = 6 * 3600  # seconds before a stored route is recomputed
+HOT_ROUTES_MAX_AGE = 24 * 3600  # stored routes older than this are not served
+HOT_ROUTES_TRACK_MAX = 10000  # distinct pairs counted at once
+
+# Default Douglas-Peucker tolerance for geometry="simplified"
+ROUTE_SIMPLIFY_TOLERANCE = 10.0  # meters
 
 
 USER_AGENT = "LocalLLM-Maps/1.0 (learning project; contact: yourname@example.com)"
 
 LLM_REQUEST_TIMEOUT = 120  # seconds
 HTTP_REQUEST_TIMEOUT = 10
+
+# POST /chat/batch
+BATCH_MAX_MESSAGES = 20
+BATCH_MAX_CONCURRENCY = 4  # messages of one batch processed at the same time
+
+# Persistent geocode cache (SQLite, shared by all workers on the host)
+GEOCODE_CACHE_PATH = "data/geocode_cache.sqlite3"
+GEOCODE_CACHE_TTL = 30 * 24 * 3600  # seconds
+GEOCODE_CACHE_MEMORY_ENTRIES = 4096  # recently used entries also kept in memory
+
+# In-process response cache for /chat
+RESPONSE_CACHE_TTL = 60  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = 2048
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_SWEEP_INTERVAL = 30  # seconds
+# Past their TTL, responses are served while refreshed in the background for
+# RESPONSE_CACHE_STALE_TTL seconds, and as a fallback when the upstreams fail
+# for RESPONSE_CACHE_STALE_IF_ERROR seconds.
+RESPONSE_CACHE_STALE_TTL = 300
+RESPONSE_CACHE_STALE_IF_ERROR = 3600
+# "No route found" and unknown place names are cached for this long
+NEGATIVE_CACHE_TTL = 30  # seconds
+
+# Cached responses also keep gzip (and, with the `brotli` package, br)
+# encoded copies when the JSON body is at least this large
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+RESPONSE_GZIP_LEVEL = 6
+RESPONSE_BROTLI_QUALITY = 5
+
+# Where rate limits and the shared response cache live.
+# "memory://" is per process; use a Redis-compatible server to share state
+# between uvicorn workers, e.g. "redis://localhost:6379/0" or
+# "unix:///run/redis/redis.sock" (requires the `redis` package).
+SHARED_STATE_URL = "memory://"
+
+# Per-upstream throttles: sustained requests/second, burst size, max
+# concurrent requests, and how long a request may queue before a 503.
+# The "public" profile follows the Photon / OSRM demo server usage policies.
+UPSTREAM_THROTTLES = MAP_DEPLOYMENTS[MAP_DEPLOYMENT]["throttles"]
+
+# Circuit breaker per Photon / OSRM endpoint: once at least `min_calls` of
+# the last `window` calls were recorded and `failure_rate` of them failed
+# (timeout, connection error, 5xx) or took longer than `slow_call_seconds`,
+# calls fail fast with a 503 for `open_seconds`, then one trial call is let through.
+CIRCUIT_BREAKER = {
+    "window": 20,
+    "min_calls": 10,
+    "failure_rate": 0.5,
+    "slow_call_seconds": 5.0,
+    "open_seconds": 15.0,
+}
+# With a secondary URL configured, a request the primary has not answered
+# within its recent p95 latency (at least HEDGE_MIN_DELAY) is also sent to
+# the secondary and the first answer wins. HEDGE_DEFAULT_DELAY applies until
+# enough latencies were seen.
+HEDGE_MIN_DELAY = 0.05  # seconds
+HEDGE_DEFAULT_DELAY = 1.0  # seconds
+
+# Long-lived connection pools, one httpx.AsyncClient per upstream.
+# Ollama is plain HTTP on localhost, so HTTP/2 only applies to the public APIs.
+HTTP_POOLS = {
+    "llm": {
+        "http2": False,
+        "max_connections": 8,
+        "max_keepalive_connections": 8,
+        "keepalive_expiry": 300.0,
+        "read_timeout": LLM_REQUEST_TIMEOUT,
+    },
+    "photon": {
+        "http2": True,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "keepalive_expiry": 30.0,
+        "read_timeout": HTTP_REQUEST_TIMEOUT,
+    },
+    "osrm": {
+        "http2": True,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "keepalive_expiry": 30.0,
+        "read_timeout": HTTP_REQUEST_TIMEOUT,
+    },
+}
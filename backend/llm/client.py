@@ -1,9 +1,26 @@
 import json
+import logging
 import re
 import httpx
 import time
-from backend.config import LLM_ENDPOINT, LLM_MODEL, LLM_REQUEST_TIMEOUT
+from backend.config import (
+    FAST_PATH_MIN_CONFIDENCE,
+    LLM_ENDPOINT,
+    LLM_KEEP_ALIVE,
+    LLM_MODEL,
+    LLM_NUM_PREDICT,
+    LLM_STREAMING,
+)
+from backend.llm.fast_path import parse_intent
+from backend.llm.intent_cache import intent_cache
+from backend.llm.scheduler import llm_scheduler
+from backend.llm.streaming import JSONObjectScanner
 from backend.schemas import LLMIntent
+from backend.utils.http import http_clients
+from backend.utils.metrics import timed
+
+
+logger = logging.getLogger(__name__)
 
 
 SYSTEM_PROMPT = """
@@ -74,12 +91,21 @@ Response:
 """
 
 
-timeout = httpx.Timeout(
-    connect=5.0,
-    read=LLM_REQUEST_TIMEOUT,
-    write=5.0,
-    pool=5.0,
-)
+# How often each extraction path is taken. "llm" counts messages routed
+# to the LLM path; "llm_calls" counts the ones not served by the intent cache.
+_intent_stats = {
+    "fast_path": 0,
+    "llm": 0,
+    "llm_calls": 0,
+}
+
+
+def intent_stats() -> dict:
+    total = _intent_stats["fast_path"] + _intent_stats["llm"]
+    return {
+        **_intent_stats,
+        "fast_path_rate": round(_intent_stats["fast_path"] / total, 3) if total else 0.0,
+    }
 
 
 def parse_json_strict(text: str) -> dict:
@@ -97,18 +123,54 @@ def parse_json_strict(text: str) -> dict:
 
 
 async def extract_intent(message: str) -> LLMIntent:
-    payload = {
+    with timed("intent_fast_path"):
+        intent, confidence = parse_intent(message)
+    if intent is not None and confidence >= FAST_PATH_MIN_CONFIDENCE:
+        _intent_stats["fast_path"] += 1
+        return intent
+
+    _intent_stats["llm"] += 1
+    return await intent_cache.get_or_compute(
+        message,
+        lambda: llm_scheduler.run(lambda: _extract_intent_llm(message)),
+    )
+
+
+def _build_payload(message: str, stream: bool, num_predict: int = LLM_NUM_PREDICT) -> dict:
+    # The static instructions go in "system" so every request shares the
+    # same prompt prefix; while the model stays loaded (keep_alive), Ollama
+    # reuses the already evaluated prefix instead of re-processing it.
+    return {
         "model": LLM_MODEL,
-        "prompt": f"{SYSTEM_PROMPT}\n\nUser: {message}",
-        "stream": False,
+        "system": SYSTEM_PROMPT,
+        "prompt": message,
+        "stream": stream,
+        "keep_alive": LLM_KEEP_ALIVE,
+        # Constrain decoding to JSON and cap generation length
+        "format": "json",
+        "options": {"num_predict": num_predict},
     }
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        start = time.time()
-        resp = await client.post(LLM_ENDPOINT, json=payload)
-        resp.raise_for_status()
-        elapsed = time.time() - start
-        print(f"LLM request took {elapsed:.2f}s")
+
+async def warm_up():
+    """
+    Load the model and evaluate the system prompt ahead of the first user
+    request. Generates a single token; the output is discarded.
+    """
+    client = http_clients.get("llm")
+
+    start = time.perf_counter()
+    resp = await client.post(
+        LLM_ENDPOINT,
+        json=_build_payload("How do I get from Monas to Sudirman?", stream=False, num_predict=1),
+    )
+    resp.raise_for_status()
+    logger.info("LLM warm-up took %.2fs", time.perf_counter() - start)
+
+
+async def _generate(client: httpx.AsyncClient, message: str) -> LLMIntent:
+    resp = await client.post(LLM_ENDPOINT, json=_build_payload(message, stream=False))
+    resp.raise_for_status()
 
     resp_json = resp.json()
 
@@ -122,13 +184,67 @@ async def extract_intent(message: str) -> LLMIntent:
 
     try:
         data = parse_json_strict(raw)
+    except Exception as e:
+        raise ValueError(f"LLM intent extraction failed: {e}") from e
+
+    return LLMIntent.model_validate(data)
+
+
+async def _generate_streaming(client: httpx.AsyncClient, message: str) -> LLMIntent:
+    """
+    Consume Ollama's token stream and stop as soon as a complete,
+    schema-valid intent has been produced. Leaving the stream early
+    closes the connection, which makes Ollama cancel the generation.
+    """
+    scanner = JSONObjectScanner()
+    last_error = None
+
+    async with client.stream(
+        "POST",
+        LLM_ENDPOINT,
+        json=_build_payload(message, stream=True),
+    ) as resp:
+        resp.raise_for_status()
+
+        async for line in resp.aiter_lines():
+            if not line.strip():
+                continue
+
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise ValueError(f"LLM error: {chunk['error']}")
+
+            for json_text in scanner.feed(chunk.get("response", "")):
+                try:
+                    return LLMIntent.model_validate(json.loads(json_text))
+                except ValueError as e:
+                    # Invalid JSON or schema; keep reading in case another object follows
+                    last_error = e
+
+            if chunk.get("done"):
+                break
+
+    if last_error is not None:
+        raise ValueError(f"LLM intent extraction failed: {last_error}")
+    raise ValueError("No JSON object found in LLM output")
+
+
+async def _extract_intent_llm(message: str) -> LLMIntent:
+    _intent_stats["llm_calls"] += 1
+
+    client = http_clients.get("llm")
+
+    try:
+        with timed("intent_llm"):
+            if LLM_STREAMING:
+                intent = await _generate_streaming(client, message)
+            else:
+                intent = await _generate(client, message)
+
     except httpx.ReadTimeout:
         raise ValueError("LLM timeout: model took too long to respond")
 
     except httpx.ConnectTimeout:
         raise ValueError("LLM connection timeout")
 
-    except Exception as e:
-        raise ValueError(f"LLM intent extraction failed: {e}") from e
-
-    return LLMIntent.model_validate(data)
+    return intent
@@ -0,0 +1,156 @@
+# backend/llm/fast_path.py
+"""
+Rule-based intent extraction for common, templated phrasings.
+
+Each rule returns a confidence score; callers fall back to the LLM when
+no rule matches or the score is below their threshold.
+"""
+
+import re
+from typing import Optional, Tuple
+
+from backend.schemas import LLMIntent
+
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+# "How do I get from Monas to Sudirman?"
+_FROM_TO = re.compile(
+    r"^(?:(?:how (?:do|can|should) i (?:get|go|drive|travel)|how to get|directions|route|"
+    r"navigate|take me|i want to go|i need to go)\s+)?"
+    r"from (?P<origin>.+?) to (?P<destination>.+)$",
+    re.IGNORECASE,
+)
+
+# "I want to go to Monumen Nasional Jakarta from Margo City Depok"
+_TO_FROM = re.compile(
+    r"^(?:(?:i want to|i need to|how (?:do|can|should) i|how to)\s+)?"
+    r"(?:go|get|drive|travel|navigate|directions|route|take me)\s+to (?P<destination>.+?)"
+    r" from (?P<origin>.+)$",
+    re.IGNORECASE,
+)
+
+# "Where can I eat ramen near Sudirman Jakarta?", "coffee shops around Kemang"
+_NEAR = re.compile(
+    r"^(?:(?:where (?:can|could|do|should) i|where to) (?:eat|find|get|buy|have|drink)\s+|"
+    r"(?:find|show|search|look|looking)(?: me| for)?\s+)?"
+    r"(?:a |an |some |the )?(?:best |good |nice |cheap )?"
+    r"(?P<query>.+?)\s+(?P<preposition>near|around|close to|nearby|in|at)\s+(?P<location>.+)$",
+    re.IGNORECASE,
+)
+
+_MOVEMENT_WORDS = {"go", "get", "from", "to", "directions", "route", "navigate", "drive", "travel"}
+
+# Relative to the user, not geocodable: "ramen near me", "from here"
+_DEICTIC_PLACES = {
+    "me", "us", "here", "there", "home", "work", "this place", "that place",
+    "current location", "my location", "where i am", "where we are",
+}
+# A query with a subject pronoun is a sentence, not a search: "I live in Depok"
+_PRONOUNS = {"i", "im", "i'm", "we", "you", "he", "she", "they", "my", "our", "me", "us"}
+# Nor is one opening with a question or auxiliary word: "Is there parking near Monas"
+_QUESTION_WORDS = {
+    "what", "which", "who", "when", "where", "why", "how", "is", "are", "was", "were", "am",
+    "do", "does", "did", "can", "could", "will", "would", "should", "shall", "may", "might",
+    "has", "have", "had",
+}
+# A second preposition or a conjunction means several requests or a nested
+# one: "ramen near Sudirman and sushi near Kemang", "to the hotel near Monas"
+_COMPOUND_WORDS = {"near", "around", "nearby", "and"}
+
+_MAX_PLACE_WORDS = 6
+_MAX_QUERY_WORDS = 4
+
+# "in"/"at" also appear inside longer phrasings ("I live in Depok"), so on
+# their own they stay below FAST_PATH_MIN_CONFIDENCE and go to the LLM
+_NEAR_CONFIDENCE = 0.9
+_IN_AT_CONFIDENCE = 0.7
+
+
+def _clean(message: str) -> str:
+    text = _WHITESPACE.sub(" ", message).strip()
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+def _plausible_place(value: str) -> bool:
+    lowered = value.lower()
+    words = lowered.split()
+    if not words or len(words) > _MAX_PLACE_WORDS:
+        return False
+    if lowered in _DEICTIC_PLACES or words[0] in ("my", "our"):
+        return False
+    if _COMPOUND_WORDS & set(words) or "close to" in lowered:
+        return False
+    # Nested "from"/"to" means the split above was probably wrong
+    return "from" not in words and "to" not in words
+
+
+def _match_directions(text: str) -> Tuple[Optional[LLMIntent], float]:
+    for pattern in (_FROM_TO, _TO_FROM):
+        match = pattern.match(text)
+        if not match:
+            continue
+
+        origin = match.group("origin").strip()
+        destination = match.group("destination").strip()
+
+        if not (_plausible_place(origin) and _plausible_place(destination)):
+            return None, 0.3
+
+        intent = LLMIntent(
+            intent="get_directions",
+            origin=origin,
+            destination=destination,
+            confidence=0.95,
+        )
+        return intent, intent.confidence
+
+    return None, 0.0
+
+
+def _match_places(text: str) -> Tuple[Optional[LLMIntent], float]:
+    match = _NEAR.match(text)
+    if not match:
+        return None, 0.0
+
+    query = match.group("query").strip()
+    location = match.group("location").strip()
+
+    query_words = query.lower().split()
+    if len(query_words) > _MAX_QUERY_WORDS or (_MOVEMENT_WORDS | _PRONOUNS) & set(query_words):
+        return None, 0.3
+
+    if query_words[0] in _QUESTION_WORDS or _COMPOUND_WORDS & set(query_words):
+        return None, 0.3
+
+    if not _plausible_place(location):
+        return None, 0.3
+
+    preposition = match.group("preposition").lower()
+    confidence = _NEAR_CONFIDENCE if preposition in ("near", "around", "close to", "nearby") else _IN_AT_CONFIDENCE
+
+    intent = LLMIntent(
+        intent="find_places",
+        query=query,
+        location=location,
+        confidence=confidence,
+    )
+    return intent, confidence
+
+
+def parse_intent(message: str) -> Tuple[Optional[LLMIntent], float]:
+    """
+    Return (intent, confidence) for `message`.
+
+    `intent` is None when no rule matched with a usable result.
+    """
+    text = _clean(message)
+    if not text:
+        return None, 0.0
+
+    intent, confidence = _match_directions(text)
+    if intent is not None:
+        return intent, confidence
+
+    return _match_places(text)
@@ -0,0 +1,169 @@
+# backend/llm/intent_cache.py
+
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, FrozenSet, NamedTuple, Optional, Tuple
+
+from backend.config import (
+    INTENT_CACHE_MAX_ENTRIES,
+    INTENT_CACHE_SIMILARITY_THRESHOLD,
+    INTENT_CACHE_TTL,
+)
+from backend.schemas import LLMIntent
+from backend.utils.cache import TTLCache
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+# Words that do not change the extracted intent. "from", "to" and "near"
+# are deliberately kept: they decide origin vs destination vs location.
+_STOPWORDS = {
+    "a", "an", "the", "please", "can", "could", "would", "should", "do", "does",
+    "i", "me", "my", "we", "where", "what", "how", "is", "are", "there", "any",
+    "some", "want", "like", "need", "hey", "hi",
+}
+
+# Infinitive "to" ("where to eat") is dropped; directional "to" is kept
+_INFINITIVE_VERBS = {"eat", "get", "go", "find", "buy", "drink", "have", "drive", "travel"}
+
+
+def normalize_message(message: str) -> str:
+    """
+    "Where can I eat Ramen near Sudirman?" -> "eat ramen near sudirman"
+    """
+    text = unicodedata.normalize("NFKC", message).casefold()
+    words = _PUNCTUATION.sub(" ", text).split()
+
+    kept = []
+    for i, word in enumerate(words):
+        if word in _STOPWORDS:
+            continue
+        if word == "to" and i + 1 < len(words) and words[i + 1] in _INFINITIVE_VERBS:
+            continue
+        kept.append(word)
+
+    return " ".join(kept)
+
+
+# Origin/destination slots of a normalized directions message
+_FROM_TO = re.compile(r"\bfrom (?P<origin>.+?) to (?P<destination>.+)$")
+_TO_FROM = re.compile(r"\bto (?P<destination>.+?) from (?P<origin>.+)$")
+
+
+def _ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    padded = f" {text} "
+    return frozenset(padded[i : i + n] for i in range(len(padded) - n + 1))
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _route_slots(key: str) -> Optional[Tuple[FrozenSet[str], FrozenSet[str]]]:
+    """
+    (origin trigrams, destination trigrams) if `key` reads like directions.
+    """
+    match = _FROM_TO.search(key) or _TO_FROM.search(key)
+    if match is None:
+        return None
+    return _ngrams(match.group("origin")), _ngrams(match.group("destination"))
+
+
+class _Indexed(NamedTuple):
+    intent: str
+    grams: FrozenSet[str]
+    slots: Optional[Tuple[FrozenSet[str], FrozenSet[str]]]
+
+
+class IntentCache:
+    """
+    Cache of validated LLM intents keyed by normalized message.
+
+    With `similarity_threshold` set, a miss on the exact key falls back to
+    the most similar cached message (character trigram Jaccard) so that
+    near-duplicate phrasings also skip model inference. Trigrams ignore
+    word order, so whole messages are only compared for find_places; a
+    directions message must match origin and destination separately
+    (otherwise "from A to B" would match "from B to A").
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = INTENT_CACHE_TTL,
+        max_entries: int = INTENT_CACHE_MAX_ENTRIES,
+        similarity_threshold: Optional[float] = INTENT_CACHE_SIMILARITY_THRESHOLD,
+    ):
+        self._cache = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._ngram_index: "OrderedDict[str, _Indexed]" = OrderedDict()
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.similar_hits = 0
+
+    def _similarity(self, grams: FrozenSet[str], slots, other: _Indexed) -> float:
+        if slots is None:
+            if other.intent != "find_places" or other.slots is not None:
+                return 0.0
+            return _jaccard(grams, other.grams)
+
+        if other.intent != "get_directions" or other.slots is None:
+            return 0.0
+        return min(_jaccard(slots[0], other.slots[0]), _jaccard(slots[1], other.slots[1]))
+
+    def _lookup_similar(self, key: str) -> Optional[LLMIntent]:
+        grams = _ngrams(key)
+        slots = _route_slots(key)
+        best_key, best_score = None, 0.0
+
+        for other_key, other in self._ngram_index.items():
+            score = self._similarity(grams, slots, other)
+            if score > best_score:
+                best_key, best_score = other_key, score
+
+        if best_key is None or best_score < self.similarity_threshold:
+            return None
+
+        intent = self._cache.get(best_key)
+        if intent is None:
+            self._ngram_index.pop(best_key, None)
+            return None
+
+        self.similar_hits += 1
+        return intent
+
+    def _remember(self, key: str, intent: LLMIntent):
+        self._ngram_index[key] = _Indexed(intent.intent, _ngrams(key), _route_slots(key))
+        self._ngram_index.move_to_end(key)
+        while len(self._ngram_index) > self.max_entries:
+            self._ngram_index.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        message: str,
+        factory: Callable[[], Awaitable[LLMIntent]],
+    ) -> LLMIntent:
+        key = normalize_message(message)
+
+        if self.similarity_threshold is not None and key not in self._ngram_index:
+            intent = self._lookup_similar(key)
+            if intent is not None:
+                return intent.model_copy()
+
+        intent = await self._cache.get_or_compute(key, factory)
+
+        if self.similarity_threshold is not None:
+            self._remember(key, intent)
+
+        # Callers may adjust the intent in place; never hand out the cached object
+        return intent.model_copy()
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "similar_hits": self.similar_hits,
+        }
+
+
+intent_cache = IntentCache()
@@ -0,0 +1,122 @@
+# backend/llm/scheduler.py
+
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from backend.config import LLM_MAX_IN_FLIGHT, LLM_MAX_QUEUE, LLM_MAX_QUEUE_WAIT
+from backend.utils.errors import ServiceOverloadedError
+
+
+T = TypeVar("T")
+
+
+class LLMScheduler:
+    """
+    Admission control for model calls.
+
+    At most `max_in_flight` calls run at once (match Ollama's
+    OLLAMA_NUM_PARALLEL); the rest wait in FIFO order. A call is shed
+    up front when the queue is full or its estimated wait exceeds
+    `max_wait`, and is shed later if it is still queued at its deadline.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+        max_queue: int = LLM_MAX_QUEUE,
+        max_wait: float = LLM_MAX_QUEUE_WAIT,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._queued = 0
+        self._in_flight = 0
+
+        # Exponentially weighted average of model call duration
+        self._service_time = None
+
+        self.admitted = 0
+        self.completed = 0
+        self.shed = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def _estimated_wait(self) -> float:
+        if self._service_time is None or self._in_flight < self.max_in_flight:
+            return 0.0
+        # Everyone ahead of us plus ourselves, served max_in_flight at a time
+        return (self._queued + 1) / self.max_in_flight * self._service_time
+
+    def _record_service_time(self, elapsed: float):
+        if self._service_time is None:
+            self._service_time = elapsed
+        else:
+            self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+
+    def _shed(self, reason: str):
+        self.shed += 1
+        retry_after = self._service_time or 1.0
+        raise ServiceOverloadedError(f"LLM overloaded: {reason}", retry_after=retry_after)
+
+    async def _acquire(self):
+        if not self._semaphore.locked():
+            # A slot is free and nobody is queued; acquire() returns immediately
+            await self._semaphore.acquire()
+            return
+
+        if self._queued >= self.max_queue:
+            self._shed("queue is full")
+
+        if self._estimated_wait() > self.max_wait:
+            self._shed("estimated queue wait exceeds budget")
+
+        self._queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queued)
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self._shed("queue wait deadline exceeded")
+        finally:
+            self._queued -= 1
+
+    async def run(self, factory: Callable[[], Awaitable[T]]) -> T:
+        enqueued = time.monotonic()
+        await self._acquire()
+
+        self.admitted += 1
+        waited = time.monotonic() - enqueued
+        self.total_wait += waited
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+
+        self._in_flight += 1
+        started = time.monotonic()
+        try:
+            result = await factory()
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+        self._record_service_time(time.monotonic() - started)
+        self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": self._queued,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "shed": self.shed,
+            "avg_wait_ms": round(1000 * self.total_wait / self.admitted, 3) if self.admitted else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait_seen, 3),
+            "avg_service_ms": round(1000 * self._service_time, 3) if self._service_time else 0.0,
+        }
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,56 @@
+# backend/llm/streaming.py
+
+from typing import List
+
+
+class JSONObjectScanner:
+    """
+    Incrementally finds complete top-level JSON objects in streamed text.
+
+    Tracks brace depth outside of string literals, so `feed()` can report
+    an object as soon as its closing brace arrives, without waiting for
+    the model to finish generating.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Consume `text` and return every object completed by it, in order.
+        """
+        completed = []
+
+        for ch in text:
+            if self._depth == 0:
+                # Skip anything between objects (whitespace, prose, markdown)
+                if ch == "{":
+                    self._buffer = [ch]
+                    self._depth = 1
+                continue
+
+            self._buffer.append(ch)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append("".join(self._buffer))
+                    self._buffer = []
+
+        return completed
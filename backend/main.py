@@ -1,25 +1,85 @@
 # backend/main.py
 
+import asyncio
+import json
 import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Annotated
+
 from fastapi import (
     FastAPI,
     HTTPException,
+    Query,
     Request,
     Depends,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, EmailStr
 
-from backend.schemas import ChatRequest, CreateKeyRequest
-from backend.services.chat_service import handle_chat
-from backend.utils.rate_limit import SimpleRateLimiter
+from backend.config import BATCH_MAX_CONCURRENCY, CACHE_SWEEP_INTERVAL, LLM_WARMUP
+from backend.llm.client import intent_stats, warm_up
+from backend.llm.intent_cache import intent_cache
+from backend.llm.scheduler import llm_scheduler
+from backend.schemas import BatchChatRequest, ChatRequest, CreateKeyRequest
+from backend.services.chat_service import cache, handle_chat, hot_routes, stream_chat
+from backend.services.proximity_cache import places_proximity_cache
+from backend.utils.rate_limit import SharedRateLimiter
+from backend.providers.geocode_cache import geocode_cache
 from backend.security.api_keys import register_api_key
 from backend.security.auth import get_current_user
+from backend.utils.circuit_breaker import CircuitOpenError, breaker_stats
+from backend.utils.errors import ServiceOverloadedError, UpstreamError
+from backend.utils.http import http_clients
+from backend.utils.metrics import render_metrics, request_seconds, stage_seconds
+from backend.utils.request_context import (
+    REQUEST_ID_HEADER,
+    configure_logging,
+    new_request_id,
+    request_id_var,
+)
+from backend.utils.shared_state import shared_state
+from backend.utils.throttle import throttle_stats
 
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="directio API")
+
+async def _warm_up_llm():
+    try:
+        await warm_up()
+    except Exception as e:
+        # Not fatal: the first request will load the model instead
+        logger.warning("LLM warm-up failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Here rather than at import time, so that importing the app (tests,
+    # gunicorn, an embedding app) does not take over its logging setup
+    configure_logging()
+
+    # Upstream connection pools live for the whole process
+    await http_clients.start()
+    cache.start_sweeper(CACHE_SWEEP_INTERVAL)
+    hot_routes.start()
+
+    # Runs in the background so the API starts even if Ollama is still booting
+    warm_up_task = asyncio.create_task(_warm_up_llm()) if LLM_WARMUP else None
+    try:
+        yield
+    finally:
+        if warm_up_task is not None:
+            warm_up_task.cancel()
+        await cache.stop_sweeper()
+        await hot_routes.stop()
+        await http_clients.close()
+        await shared_state.close()
+        geocode_cache.close()
+
+
+app = FastAPI(title="directio API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,18 +91,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REQUEST_ID_HEADER, "ETag"],
 )
 
 
-# Rate limiters
-chat_rate_limiter = SimpleRateLimiter(
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    # Tag every log line of this request, and echo the ID back to the caller
+    request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+    token = request_id_var.set(request_id)
+
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+    finally:
+        # Route template rather than raw path keeps label cardinality bounded
+        route = request.scope.get("route")
+        request_seconds.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            path=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+        request_id_var.reset(token)
+
+
+# Rate limiters (state is shared across workers when SHARED_STATE_URL is Redis)
+chat_rate_limiter = SharedRateLimiter(
+    "chat",
     max_requests=10,
     window_seconds=60,
+    backend=shared_state,
 )
 
-key_creation_limiter = SimpleRateLimiter(
+key_creation_limiter = SharedRateLimiter(
+    "keys",
     max_requests=3,
     window_seconds=3600,  # very strict
+    backend=shared_state,
 )
 
 
@@ -51,11 +141,39 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/stats")
+async def stats():
+    """
+    Runtime statistics used to size pools and caches under load.
+    """
+    return {
+        "http_pools": http_clients.stats(),
+        "upstream_throttles": throttle_stats(),
+        "circuit_breakers": breaker_stats(),
+        "geocode_cache": geocode_cache.stats(),
+        "response_cache": cache.stats(),
+        "hot_routes": hot_routes.stats(),
+        "places_proximity_cache": places_proximity_cache.stats() if places_proximity_cache else None,
+        "intent": intent_stats(),
+        "intent_cache": intent_cache.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "stages": stage_seconds.summary(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Per-stage and per-endpoint latency histograms in Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/keys")
 async def create_api_key(request: Request, payload: CreateKeyRequest):
     client_ip = request.client.host
 
-    if not key_creation_limiter.allow(client_ip):
+    if not await key_creation_limiter.allow(client_ip):
         raise HTTPException(
             status_code=429,
             detail="Too many key creation requests",
@@ -86,19 +204,181 @@ async def chat(
     Authorization is done via API key.
     Rate limiting is enforced per user.
     """
+    return await _chat(request, req, user)
+
+
+@app.get("/chat")
+async def chat_get(
+    request: Request,
+    req: Annotated[ChatRequest, Query()],
+    user=Depends(get_current_user),
+):
+    """
+    Same as POST /chat with the body as query parameters, so clients and
+    caches can revalidate with If-None-Match.
+    """
+    return await _chat(request, req, user)
+
+
+async def _chat(request: Request, req: ChatRequest, user: dict) -> Response:
     owner = user["owner"]
 
-    if not chat_rate_limiter.allow(owner):
+    if not await chat_rate_limiter.allow(owner, max_requests=user["rate_limit"]):
         raise HTTPException(status_code=429, detail="Too many requests")
 
     try:
-        return await handle_chat(req.message)
+        result = await handle_chat(
+            req.message,
+            geometry=req.geometry,
+            simplify_tolerance=req.simplify_tolerance,
+        )
+    except Exception as e:
+        raise _to_http_error(e, "/chat")
 
-    except ValueError as e:
+    # The body may differ per Accept-Encoding; the ETag does not
+    headers = {"ETag": result.etag, "Vary": "Accept-Encoding"}
+
+    if result.not_modified(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    body, encoding = result.negotiate(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _to_http_error(e: Exception, endpoint: str) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+
+    if isinstance(e, (ServiceOverloadedError, CircuitOpenError)):
+        # Shed load rather than queueing past the latency budget
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))},
+        )
+
+    if isinstance(e, UpstreamError):
+        # A map service failed and nothing usable was cached
+        return HTTPException(status_code=502, detail=str(e))
+
+    if isinstance(e, ValueError):
         # Expected client-side errors
-        raise HTTPException(status_code=400, detail=str(e))
+        return HTTPException(status_code=400, detail=str(e))
+
+    # Unexpected server-side errors
+    logger.exception("Unhandled error in %s", endpoint)
+    return HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.post("/chat/batch")
+async def chat_batch(
+    req: BatchChatRequest,
+    user=Depends(get_current_user),
+):
+    """
+    Resolve several messages in one call.
+
+    Duplicate messages are processed once. Every unique message counts
+    against the user's rate limit. Results stream back as NDJSON, one line
+    per input message in completion order:
+    {"index": 0, "status": 200, "result": {...}} or
+    {"index": 1, "status": 429, "error": "Too many requests"}.
+    """
+    owner = user["owner"]
+
+    # message -> indexes in the request it answers
+    positions = {}
+    for index, message in enumerate(req.messages):
+        positions.setdefault(message.strip(), []).append(index)
+
+    admitted, limited = [], []
+    for message in positions:
+        if await chat_rate_limiter.allow(owner, max_requests=user["rate_limit"]):
+            admitted.append(message)
+        else:
+            limited.append(message)
+
+    if not admitted:
+        raise HTTPException(status_code=429, detail="Too many requests")
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def run(message: str):
+        async with semaphore:
+            try:
+                response = await handle_chat(
+                    message,
+                    geometry=req.geometry,
+                    simplify_tolerance=req.simplify_tolerance,
+                )
+                return message, {"status": 200, "result": response.json()}
+            except Exception as e:
+                error = _to_http_error(e, "/chat/batch")
+                return message, {"status": error.status_code, "error": error.detail}
+
+    def lines(message: str, outcome: dict):
+        for index in positions[message]:
+            yield json.dumps({"index": index, **outcome}) + "\n"
+
+    async def stream():
+        tasks = [asyncio.create_task(run(message)) for message in admitted]
+        try:
+            for message in limited:
+                for line in lines(message, {"status": 429, "error": "Too many requests"}):
+                    yield line
+
+            for next_done in asyncio.as_completed(tasks):
+                message, outcome = await next_done
+                for line in lines(message, outcome):
+                    yield line
+        finally:
+            # Client went away: stop work nobody will read
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(
+    req: ChatRequest,
+    user=Depends(get_current_user),
+):
+    """
+    Server-Sent Events variant of /chat.
+
+    Emits `intent`, then `places` or `endpoints` + `route`, then `done`,
+    so clients can render partial results while later stages run.
+    Failures after the stream has started arrive as an `error` event.
+    """
+    owner = user["owner"]
+
+    if not await chat_rate_limiter.allow(owner, max_requests=user["rate_limit"]):
+        raise HTTPException(status_code=429, detail="Too many requests")
+
+    async def events():
+        try:
+            async for event, payload in stream_chat(
+                req.message,
+                geometry=req.geometry,
+                simplify_tolerance=req.simplify_tolerance,
+            ):
+                yield _sse(event, payload)
+        except Exception as e:
+            error = _to_http_error(e, "/chat/stream")
+            yield _sse("error", {"status": error.status_code, "detail": error.detail})
+            return
+
+        yield _sse("done", {})
 
-    except Exception:
-        # Unexpected server-side errors
-        logger.exception("Unhandled error in /chat")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
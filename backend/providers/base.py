@@ -8,5 +8,19 @@ class MapProvider(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_directions(self, origin: str, destination: str):
+    async def get_directions(self, origin, destination, overview: str = "full"):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_route(self, waypoints, overview: str = "full"):
+        """
+        Route visiting `waypoints` [(lat, lon), ...] in order.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_distance_matrix(self, sources, destinations):
+        """
+        Travel durations/distances from every source to every destination.
+        """
         raise NotImplementedError
@@ -0,0 +1,154 @@
+# backend/providers/geocode_cache.py
+
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from backend.config import GEOCODE_CACHE_MEMORY_ENTRIES, GEOCODE_CACHE_PATH, GEOCODE_CACHE_TTL
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_place_name(text: str) -> str:
+    """
+    "  Monas, Jakarta! " -> "monas jakarta"
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class GeocodeCache:
+    """
+    Long-lived geocode cache backed by SQLite.
+
+    Entries survive restarts and are shared by every uvicorn worker on
+    the host (WAL mode allows concurrent readers). Expiry uses wall-clock
+    time because it is compared across processes.
+
+    Recently used entries are also kept in an in-memory LRU, so repeated
+    lookups never reach SQLite; the file is read and written in a worker
+    thread to keep the event loop free.
+    """
+
+    def __init__(
+        self,
+        path: str = GEOCODE_CACHE_PATH,
+        ttl_seconds: int = GEOCODE_CACHE_TTL,
+        memory_entries: int = GEOCODE_CACHE_MEMORY_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl_seconds
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # key -> (lat, lon, expires_at), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,  # autocommit
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " key TEXT PRIMARY KEY,"
+                " lat REAL NOT NULL,"
+                " lon REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+
+        return self._conn
+
+    def _remember(self, key: str, lat: float, lon: float, expires_at: float):
+        self._memory[key] = (lat, lon, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[Tuple[float, float, float]]:
+        with self._lock:
+            return (
+                self._connect()
+                .execute(
+                    "SELECT lat, lon, expires_at FROM geocode WHERE key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+
+    def _write(self, key: str, lat: float, lon: float, expires_at: float):
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO geocode (key, lat, lon, expires_at) VALUES (?, ?, ?, ?)",
+                (key, lat, lon, expires_at),
+            )
+
+    async def get(self, query: str) -> Optional[Tuple[float, float]]:
+        key = normalize_place_name(query)
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[2] >= time.time():
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return entry[0], entry[1]
+            del self._memory[key]
+
+        row = await asyncio.to_thread(self._read, key)
+
+        if row is None or row[2] < time.time():
+            self.misses += 1
+            return None
+
+        self._remember(key, *row)
+        self.hits += 1
+        return row[0], row[1]
+
+    async def set(self, query: str, coords: Tuple[float, float]):
+        key = normalize_place_name(query)
+        lat, lon = coords
+        expires_at = time.time() + self.ttl
+
+        self._remember(key, lat, lon, expires_at)
+        await asyncio.to_thread(self._write, key, lat, lon, expires_at)
+
+    def close(self):
+        self._memory.clear()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+geocode_cache = GeocodeCache()
@@ -0,0 +1,276 @@
+# backend/providers/local_poi.py
+"""
+Offline place search over an OSM POI extract.
+
+Build an index once from a GeoJSON FeatureCollection of points (e.g. an
+osmium/ogr export of Jakarta metro amenities and shops):
+
+    python -m backend.providers.local_poi build jakarta_pois.geojson data/poi/jakarta
+
+then set LOCAL_POI_INDEX_PATH = "data/poi/jakarta" in backend/config.py.
+
+Index layout (all arrays are .npy files opened memory-mapped, so workers
+share the OS page cache and startup does not read the whole extract):
+
+    coords.npy          float64 (N, 2)   [lon, lat] per POI
+    cell_keys.npy       int64   (C,)     sorted grid cell codes
+    cell_starts.npy     int64   (C + 1,) offsets into cell_items
+    cell_items.npy      int32   (N,)     POI ids grouped by cell
+    props.bin           bytes            JSON properties, concatenated
+    props_offsets.npy   int64   (N + 1,) offsets into props.bin
+    text_postings.npy   int32            POI ids per token (names + categories)
+    place_postings.npy  int32            POI ids per token (name/street/district/city)
+    tokens.json         {"text": {token: [start, end]}, "place": {...}, "cell_degrees": float}
+"""
+
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.providers.geocode_cache import normalize_place_name
+
+
+EARTH_RADIUS_METERS = 6371008.8
+
+# Properties that describe what a POI is, indexed alongside its name
+_CATEGORY_KEYS = ("osm_value", "amenity", "shop", "cuisine", "tourism", "leisure")
+# Properties that describe where a POI is, used to resolve the search location
+_PLACE_KEYS = ("name", "street", "district", "suburb", "city")
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return normalize_place_name(str(text).replace("_", " ")).split()
+
+
+def _cell_codes(lon: np.ndarray, lat: np.ndarray, cell_degrees: float) -> np.ndarray:
+    ix = np.floor((lon + 180.0) / cell_degrees).astype(np.int64)
+    iy = np.floor((lat + 90.0) / cell_degrees).astype(np.int64)
+    return iy * 1_000_000 + ix
+
+
+def _postings(index: Dict[str, List[int]]) -> Tuple[Dict[str, List[int]], np.ndarray]:
+    ranges = {}
+    chunks = []
+    offset = 0
+    for token in sorted(index):
+        ids = np.unique(np.asarray(index[token], dtype=np.int32))
+        ranges[token] = [offset, offset + len(ids)]
+        chunks.append(ids)
+        offset += len(ids)
+
+    postings = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int32)
+    return ranges, postings
+
+
+def build_index(features: Iterable[dict], out_dir: str, cell_degrees: float = 0.01) -> int:
+    """
+    Write a local POI index for Point `features` to `out_dir`.
+    Returns the number of POIs indexed.
+    """
+    coords = []
+    props_blobs = []
+    text_index: Dict[str, List[int]] = defaultdict(list)
+    place_index: Dict[str, List[int]] = defaultdict(list)
+
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        props = feature.get("properties") or {}
+        if geometry.get("type") != "Point" or not props.get("name"):
+            continue
+
+        poi_id = len(coords)
+        lon, lat = geometry["coordinates"][:2]
+        coords.append((float(lon), float(lat)))
+        props_blobs.append(json.dumps(props, ensure_ascii=False).encode())
+
+        for token in _tokens(props.get("name")):
+            text_index[token].append(poi_id)
+        for key in _CATEGORY_KEYS:
+            for token in _tokens(props.get(key)):
+                text_index[token].append(poi_id)
+        for key in _PLACE_KEYS:
+            for token in _tokens(props.get(key)):
+                place_index[token].append(poi_id)
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    coords_arr = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    np.save(os.path.join(out_dir, "coords.npy"), coords_arr)
+
+    # Grid index in CSR form: POI ids sorted by cell, plus per-cell offsets
+    codes = _cell_codes(coords_arr[:, 0], coords_arr[:, 1], cell_degrees)
+    order = np.argsort(codes, kind="stable")
+    cell_keys, starts = np.unique(codes[order], return_index=True)
+    np.save(os.path.join(out_dir, "cell_keys.npy"), cell_keys)
+    np.save(os.path.join(out_dir, "cell_starts.npy"), np.append(starts, len(order)).astype(np.int64))
+    np.save(os.path.join(out_dir, "cell_items.npy"), order.astype(np.int32))
+
+    with open(os.path.join(out_dir, "props.bin"), "wb") as f:
+        for blob in props_blobs:
+            f.write(blob)
+    offsets = np.zeros(len(props_blobs) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in props_blobs])
+    np.save(os.path.join(out_dir, "props_offsets.npy"), offsets)
+
+    text_ranges, text_postings = _postings(text_index)
+    place_ranges, place_postings = _postings(place_index)
+    np.save(os.path.join(out_dir, "text_postings.npy"), text_postings)
+    np.save(os.path.join(out_dir, "place_postings.npy"), place_postings)
+
+    with open(os.path.join(out_dir, "tokens.json"), "w", encoding="utf-8") as f:
+        json.dump({"text": text_ranges, "place": place_ranges, "cell_degrees": cell_degrees}, f)
+
+    return len(coords)
+
+
+class LocalPOIProvider:
+    """
+    Place search over a prebuilt local POI index (see module docstring).
+    Search only: the composite OpenStreetMapProvider routes with OSRM.
+
+    Returns Photon-shaped GeoJSON features so results go through the same
+    normalization as remote searches. An empty result means "not covered
+    by this extract"; callers fall back to the remote provider.
+    """
+
+    def __init__(self, index_dir: str, radius_meters: float):
+        self.radius = radius_meters
+
+        def load(name):
+            return np.load(os.path.join(index_dir, name), mmap_mode="r")
+
+        self._coords = load("coords.npy")
+        self._cell_keys = load("cell_keys.npy")
+        self._cell_starts = load("cell_starts.npy")
+        self._cell_items = load("cell_items.npy")
+        self._props_offsets = load("props_offsets.npy")
+        self._text_postings = load("text_postings.npy")
+        self._place_postings = load("place_postings.npy")
+        self._props = np.memmap(os.path.join(index_dir, "props.bin"), dtype=np.uint8, mode="r")
+
+        with open(os.path.join(index_dir, "tokens.json"), encoding="utf-8") as f:
+            tokens = json.load(f)
+        self._text_ranges = tokens["text"]
+        self._place_ranges = tokens["place"]
+        self._cell_degrees = tokens["cell_degrees"]
+
+    def _lookup(self, token: str, ranges: dict, postings: np.ndarray) -> np.ndarray:
+        bounds = ranges.get(token)
+        if bounds is None:
+            return np.zeros(0, dtype=np.int32)
+        return postings[bounds[0] : bounds[1]]
+
+    def _resolve_location(self, location: str) -> Optional[Tuple[float, float]]:
+        """
+        Median position of POIs whose name/street/area match every location token.
+        """
+        tokens = _tokens(location)
+        if not tokens:
+            return None
+
+        ids = None
+        for token in tokens:
+            matches = self._lookup(token, self._place_ranges, self._place_postings)
+            ids = matches if ids is None else np.intersect1d(ids, matches, assume_unique=True)
+            if len(ids) == 0:
+                return None
+
+        lon, lat = np.median(self._coords[ids], axis=0)
+        return float(lon), float(lat)
+
+    def _nearby(self, lon: float, lat: float) -> np.ndarray:
+        """
+        POI ids in grid cells overlapping the search radius.
+        """
+        lat_span = math.degrees(self.radius / EARTH_RADIUS_METERS)
+        lon_span = lat_span / max(math.cos(math.radians(lat)), 1e-6)
+        steps_x = int(math.ceil(lon_span / self._cell_degrees))
+        steps_y = int(math.ceil(lat_span / self._cell_degrees))
+
+        dx, dy = np.meshgrid(np.arange(-steps_x, steps_x + 1), np.arange(-steps_y, steps_y + 1))
+        lons = lon + dx.ravel() * self._cell_degrees
+        lats = lat + dy.ravel() * self._cell_degrees
+        wanted = np.unique(_cell_codes(lons, lats, self._cell_degrees))
+
+        positions = np.searchsorted(self._cell_keys, wanted)
+        in_range = positions < len(self._cell_keys)
+        positions, wanted = positions[in_range], wanted[in_range]
+        positions = positions[self._cell_keys[positions] == wanted]
+        if len(positions) == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        return np.concatenate(
+            [self._cell_items[self._cell_starts[p] : self._cell_starts[p + 1]] for p in positions]
+        )
+
+    def _distances(self, ids: np.ndarray, lon: float, lat: float) -> np.ndarray:
+        points = np.radians(self._coords[ids])
+        lon0, lat0 = math.radians(lon), math.radians(lat)
+        x = (points[:, 0] - lon0) * math.cos(lat0)
+        y = points[:, 1] - lat0
+        return np.hypot(x, y) * EARTH_RADIUS_METERS
+
+    def _feature(self, poi_id: int) -> dict:
+        start, end = int(self._props_offsets[poi_id]), int(self._props_offsets[poi_id + 1])
+        props = json.loads(self._props[start:end].tobytes())
+        lon, lat = self._coords[poi_id]
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+            "properties": props,
+        }
+
+    async def search_places(self, query: str, location: str, limit: int) -> List[dict]:
+        if not query:
+            raise ValueError("Query must be provided")
+
+        center = self._resolve_location(location)
+        if center is None:
+            return []
+
+        nearby = self._nearby(*center)
+        if len(nearby) == 0:
+            return []
+
+        # Score = number of query tokens a POI matches (name or category)
+        scores = np.zeros(len(nearby), dtype=np.int32)
+        for token in _tokens(query):
+            matches = self._lookup(token, self._text_ranges, self._text_postings)
+            scores += np.isin(nearby, matches, assume_unique=True)
+
+        candidates = scores > 0
+        if not candidates.any():
+            return []
+
+        ids = nearby[candidates]
+        distances = self._distances(ids, *center)
+        within = distances <= self.radius
+        ids, distances, id_scores = ids[within], distances[within], scores[candidates][within]
+
+        # Best textual match first, then nearest
+        ranked = np.lexsort((distances, -id_scores))[:limit]
+        return [self._feature(int(ids[i])) for i in ranked]
+
+
+def _main(argv: List[str]) -> int:
+    if len(argv) != 4 or argv[1] != "build":
+        print("usage: python -m backend.providers.local_poi build <pois.geojson> <out_dir>")
+        return 2
+
+    with open(argv[2], encoding="utf-8") as f:
+        collection = json.load(f)
+
+    count = build_index(collection.get("features", []), argv[3])
+    print(f"Indexed {count} POIs into {argv[3]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv))
@@ -1,13 +1,21 @@
 # backend/providers/openstreetmap.py
 
+import asyncio
+from typing import List, Tuple
+
+from backend.config import LOCAL_POI_INDEX_PATH, LOCAL_POI_SEARCH_RADIUS, NEGATIVE_CACHE_TTL
 from backend.providers.base import MapProvider
+from backend.providers.geocode_cache import geocode_cache, normalize_place_name
 from backend.providers.photon import PhotonProvider
 from backend.providers.osm import OSMProvider
+from backend.utils.cache import TTLCache
+from backend.utils.errors import NoResultError
 
 
 class OpenStreetMapProvider(MapProvider):
     """
     Composite provider that uses:
+    - a local POI index for place search, when configured
     - Photon for geocoding / place search
     - OSRM (via OSMProvider) for routing
     """
@@ -15,25 +23,70 @@ class OpenStreetMapProvider(MapProvider):
     def __init__(self):
         self._geocoder = PhotonProvider()
         self._router = OSMProvider()
+        self._local = None
+        # Place names Photon recently had no match for
+        self._geocode_misses = TTLCache(ttl_seconds=NEGATIVE_CACHE_TTL, max_entries=4096)
+
+        if LOCAL_POI_INDEX_PATH:
+            from backend.providers.local_poi import LocalPOIProvider
+
+            self._local = LocalPOIProvider(LOCAL_POI_INDEX_PATH, radius_meters=LOCAL_POI_SEARCH_RADIUS)
 
     async def search_places(self, query: str, location: str, limit: int):
+        if self._local is not None and location:
+            # Areas outside the extract return nothing and fall through to Photon
+            results = await self._local.search_places(query=query, location=location, limit=limit)
+            if results:
+                return results
+
         return await self._geocoder.search_places(
             query=query,
             location=location,
             limit=limit,
         )
 
-    async def get_directions(self, origin, destination):
+    async def get_directions(self, origin, destination, overview="full"):
         return await self._router.get_directions(
             origin=origin,
             destination=destination,
+            overview=overview,
+        )
+
+    async def get_route(self, waypoints, overview="full"):
+        return await self._router.get_route(waypoints, overview=overview)
+
+    async def get_distance_matrix(self, sources, destinations):
+        return await self._router.get_table(
+            sources=sources,
+            destinations=destinations,
         )
 
     async def geocode(self, query: str):
+        cached = await geocode_cache.get(query)
+        if cached:
+            return cached
+
+        miss_key = normalize_place_name(query)
+        if self._geocode_misses.get(miss_key):
+            raise NoResultError(f"Could not geocode location: {query}")
+
         results = await self.search_places(query=query, location="", limit=1)
         if not results:
-            raise ValueError(f"Could not geocode location: {query}")
+            self._geocode_misses.set(miss_key, True)
+            raise NoResultError(f"Could not geocode location: {query}")
 
         coords = results[0]["geometry"]["coordinates"]
         lon, lat = coords
+
+        await geocode_cache.set(query, (lat, lon))
         return lat, lon
+
+    async def geocode_many(self, queries: List[str]) -> List[Tuple[float, float]]:
+        """
+        Geocode several place names concurrently.
+
+        Requests are bounded by Photon's concurrency budget, so latency is
+        that of the slowest lookup rather than the sum. Results keep the
+        order of `queries`; the first failure is raised.
+        """
+        return list(await asyncio.gather(*(self.geocode(q) for q in queries)))
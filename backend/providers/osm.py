@@ -1,72 +1,59 @@
 # backend/providers/osm.py
 
-import asyncio
-import httpx
-from typing import List
+from typing import List, Tuple
 
-from backend.config import (
-    OSRM_BASE_URL,
-    HTTP_REQUEST_TIMEOUT,
-)
+from backend.config import OSRM_BASE_URL, OSRM_PROFILE, OSRM_SECONDARY_URL
+from backend.providers.upstream import Upstream
+from backend.utils.errors import NoResultError, UpstreamError
 
 
 class OSMProvider:
     """
     OpenStreetMap provider using:
-    - Nominatim for place search
-    - OSRM for routing (later)
+    - OSRM for routing, multi-waypoint routes and distance matrices
     """
 
     def __init__(self):
-        # Simple in-process rate limiting (OSM policy-friendly)
-        self._lock = asyncio.Lock()
-        self._last_request_ts = 0.0
-        self._min_interval = 1.5  # 1 request per second
-
-    async def _rate_limit(self):
-        async with self._lock:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_request_ts
-            if elapsed < self._min_interval:
-                await asyncio.sleep(self._min_interval - elapsed)
-            self._last_request_ts = asyncio.get_event_loop().time()
-
-    async def get_directions(self, origin: tuple, destination: tuple):
-        """
-        origin, destination: (lat, lon)
-        """
-        lat1, lon1 = origin
-        lat2, lon2 = destination
+        # Shared rate/concurrency budget (OSM policy-friendly) and circuit breakers
+        self._upstream = Upstream("osrm", "OSRM", OSRM_BASE_URL, OSRM_SECONDARY_URL)
 
-        url = f"{OSRM_BASE_URL}/route/v1/driving/" f"{lon1},{lat1};{lon2},{lat2}"
+    @staticmethod
+    def _coordinates(points: List[Tuple[float, float]]) -> str:
+        # OSRM expects lon,lat pairs separated by ";"
+        return ";".join(f"{lon},{lat}" for lat, lon in points)
 
-        params = {
-            "overview": "full",
-            "geometries": "geojson",
-        }
+    async def _request(self, service: str, points: List[Tuple[float, float]], params: dict) -> dict:
+        # Built by hand: OSRM list parameters use literal ";" and "," separators
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        path = f"/{service}/v1/{OSRM_PROFILE}/{self._coordinates(points)}?{query}"
+
+        resp = await self._upstream.get(path, stage=f"osrm_{service}")
 
-        timeout = httpx.Timeout(
-            connect=5.0,
-            read=HTTP_REQUEST_TIMEOUT,
-            write=5.0,
-            pool=5.0,
-        )
+        if resp.status_code == 400:
+            # OSRM answers 400 for unroutable input (NoRoute, NoSegment)
+            raise NoResultError(f"OSRM routing failed with status {resp.status_code}")
+        if resp.is_error:
+            raise UpstreamError(f"OSRM routing failed with status {resp.status_code}")
 
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                resp = await client.get(url, params=params)
-                resp.raise_for_status()
+        return resp.json()
 
-        except httpx.ReadTimeout:
-            raise ValueError("OSRM routing timeout")
+    async def get_route(self, waypoints: List[Tuple[float, float]], overview: str = "full"):
+        """
+        waypoints: [(lat, lon), ...], at least two, visited in order
+        overview: "full" or "simplified" (OSRM's zoom-dependent overview)
+        """
+        if len(waypoints) < 2:
+            raise ValueError("A route needs at least two waypoints")
 
-        except httpx.HTTPStatusError as e:
-            raise ValueError(f"OSRM routing failed with status {e.response.status_code}")
+        params = {
+            "overview": overview,
+            "geometries": "geojson",
+        }
 
-        data = resp.json()
+        data = await self._request("route", waypoints, params)
 
         if "routes" not in data or not data["routes"]:
-            raise ValueError("No route found")
+            raise NoResultError("No route found")
 
         route = data["routes"][0]
 
@@ -74,4 +61,43 @@ class OSMProvider:
             "distance": route["distance"],
             "duration": route["duration"],
             "geometry": route["geometry"],
+            "legs": [{"distance": leg["distance"], "duration": leg["duration"]} for leg in route.get("legs", [])],
+        }
+
+    async def get_directions(self, origin: tuple, destination: tuple, overview: str = "full"):
+        """
+        origin, destination: (lat, lon)
+        """
+        return await self.get_route([origin, destination], overview=overview)
+
+    async def get_table(
+        self,
+        sources: List[Tuple[float, float]],
+        destinations: List[Tuple[float, float]],
+    ):
+        """
+        Travel time / distance matrix from every source to every destination
+        in a single OSRM /table call.
+
+        Returns {"durations": [[s]], "distances": [[m]]} indexed
+        [source][destination]; unreachable pairs are None.
+        """
+        if not sources or not destinations:
+            raise ValueError("Distance matrix needs at least one source and one destination")
+
+        points = list(sources) + list(destinations)
+        params = {
+            "sources": ";".join(str(i) for i in range(len(sources))),
+            "destinations": ";".join(str(i) for i in range(len(sources), len(points))),
+            "annotations": "duration,distance",
+        }
+
+        data = await self._request("table", points, params)
+
+        if data.get("code") != "Ok" or "durations" not in data:
+            raise NoResultError("No distance matrix found")
+
+        return {
+            "durations": data["durations"],
+            "distances": data.get("distances"),
         }
@@ -1,11 +1,10 @@
 # backend/providers/photon.py
 
-import asyncio
-import httpx
-import time
 from typing import List
 
-from backend.config import PHOTON_BASE_URL, HTTP_REQUEST_TIMEOUT
+from backend.config import PHOTON_BASE_URL, PHOTON_SECONDARY_URL
+from backend.providers.upstream import Upstream
+from backend.utils.errors import UpstreamError
 
 
 class PhotonProvider:
@@ -28,15 +27,8 @@ class PhotonProvider:
     _INDONESIA_BBOX = "95.0,-11.0,141.0,6.0"
 
     def __init__(self):
-        self._last_request = 0.0
-        self._min_interval = 1.0  # 1 request / second (Photon-friendly)
-
-    async def _rate_limit(self):
-        now = time.time()
-        elapsed = now - self._last_request
-        if elapsed < self._min_interval:
-            await asyncio.sleep(self._min_interval - elapsed)
-        self._last_request = time.time()
+        # Shared rate/concurrency budget (Photon-friendly) and circuit breakers
+        self._upstream = Upstream("photon", "Photon", PHOTON_BASE_URL, PHOTON_SECONDARY_URL)
 
     async def search_places(
         self,
@@ -63,32 +55,10 @@ class PhotonProvider:
             "Accept": "application/json",
         }
 
-        timeout = httpx.Timeout(
-            connect=5.0,
-            read=HTTP_REQUEST_TIMEOUT,
-            write=5.0,
-            pool=5.0,
-        )
-
-        await self._rate_limit()
-
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                resp = await client.get(
-                    PHOTON_BASE_URL,
-                    params=params,
-                    headers=headers,
-                )
-                resp.raise_for_status()
-
-        except httpx.ReadTimeout:
-            raise ValueError("Photon search timed out")
-
-        except httpx.HTTPStatusError as e:
-            raise ValueError(f"Photon search failed with status {e.response.status_code}")
+        resp = await self._upstream.get(params=params, headers=headers, stage="photon_search")
 
-        except httpx.RequestError as e:
-            raise ValueError(f"Photon request error: {e}")
+        if resp.is_error:
+            raise UpstreamError(f"Photon search failed with status {resp.status_code}")
 
         data = resp.json()
 
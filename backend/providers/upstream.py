@@ -0,0 +1,75 @@
+# backend/providers/upstream.py
+
+from typing import Optional
+
+import httpx
+
+from backend.utils.circuit_breaker import get_breaker, hedged
+from backend.utils.errors import UpstreamError
+from backend.utils.http import http_clients
+from backend.utils.metrics import timed
+from backend.utils.throttle import get_throttle
+
+
+class Upstream:
+    """
+    GET requests to one map service (Photon or OSRM).
+
+    The primary base URL and the optional secondary one each sit behind
+    their own circuit breaker. With a secondary configured, requests are
+    hedged: one the primary has not answered within its recent p95 latency
+    (or that it failed / refused) is also sent to the secondary, and the
+    first answer wins. Both share the upstream's throttle and pool.
+
+    Timeouts, connection errors, 429 and 5xx raise UpstreamError; other
+    responses, including 4xx, are returned for the caller to interpret.
+    """
+
+    def __init__(self, name: str, label: str, base_url: str, secondary_url: Optional[str] = None):
+        self.name = name
+        self.label = label
+        self.base_url = base_url
+        self.secondary_url = secondary_url
+
+        self._throttle = get_throttle(name)
+        self._breaker = get_breaker(name)
+        self._secondary_breaker = get_breaker(f"{name}_secondary") if secondary_url else None
+
+    async def _attempt(self, base_url: str, breaker, path: str, stage: str, **kwargs) -> httpx.Response:
+        client = http_clients.get(self.name)
+
+        # Fail fast without queueing for a slot while the circuit is open
+        breaker.check()
+
+        async with self._throttle.slot():
+            # Inside the slot: local queueing is not upstream latency
+            async with breaker.call():
+                try:
+                    with timed(stage):
+                        resp = await client.get(base_url + path, **kwargs)
+
+                except httpx.TimeoutException:
+                    raise UpstreamError(f"{self.label} request timed out")
+
+                except httpx.RequestError as e:
+                    raise UpstreamError(f"{self.label} request error: {e}")
+
+                if resp.status_code >= 500 or resp.status_code == 429:
+                    raise UpstreamError(f"{self.label} request failed with status {resp.status_code}")
+
+                return resp
+
+    async def get(self, path: str = "", stage: Optional[str] = None, **kwargs) -> httpx.Response:
+        """
+        GET `path` relative to the base URL; `kwargs` go to httpx.
+        """
+        stage = stage or self.name
+
+        if self._secondary_breaker is None:
+            return await self._attempt(self.base_url, self._breaker, path, stage, **kwargs)
+
+        return await hedged(
+            lambda: self._attempt(self.base_url, self._breaker, path, stage, **kwargs),
+            lambda: self._attempt(self.secondary_url, self._secondary_breaker, path, f"{stage}_secondary", **kwargs),
+            delay=self._breaker.hedge_delay(),
+        )
@@ -1,10 +1,32 @@
 # backend/schemas.py
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Literal, Optional
+from typing import Annotated, List, Literal, Optional, Union
+
+from backend.config import BATCH_MAX_MESSAGES
+
+
+# Route geometry returned for directions:
+# - "full": every point of the route, GeoJSON
+# - "overview": OSRM's own simplified overview, GeoJSON
+# - "simplified": Douglas-Peucker at `simplify_tolerance` meters, GeoJSON
+# - "polyline6": encoded polyline (precision 6), simplified if a tolerance is given
+GeometryMode = Literal["full", "overview", "simplified", "polyline6"]
 
 
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1)
+    geometry: GeometryMode = "full"
+    simplify_tolerance: Optional[float] = Field(default=None, gt=0)  # meters
+
+
+class BatchChatRequest(BaseModel):
+    messages: List[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_MESSAGES,
+    )
+    geometry: GeometryMode = "full"
+    simplify_tolerance: Optional[float] = Field(default=None, gt=0)  # meters
 
 
 class LLMIntent(BaseModel):
@@ -14,6 +36,8 @@ class LLMIntent(BaseModel):
     origin: Optional[str] = None
     destination: Optional[str] = None
     limit: int = Field(default=5, ge=1, le=10)
+    # Set by the rule-based fast path; None when the intent came from the LLM
+    confidence: Optional[float] = Field(default=None, exclude=True)
 
 
 class Place(BaseModel):
@@ -37,7 +61,8 @@ class ErrorResponse(BaseModel):
 class Route(BaseModel):
     distance_meters: float
     duration_seconds: float
-    geometry: dict  # GeoJSON LineString
+    geometry: Union[dict, str]  # GeoJSON LineString, or encoded polyline
+    geometry_format: Literal["geojson", "polyline6"] = "geojson"
 
 
 class DirectionsResponse(BaseModel):
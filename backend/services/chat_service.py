@@ -1,20 +1,50 @@
 # backend/services/chat_service.py
 
+import asyncio
 import logging
+import time
 
 from fastapi import HTTPException
 
+from backend.config import (
+    NEGATIVE_CACHE_TTL,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_STALE_IF_ERROR,
+    RESPONSE_CACHE_STALE_TTL,
+    RESPONSE_CACHE_TTL,
+    ROUTE_SIMPLIFY_TOLERANCE,
+)
 from backend.llm.client import extract_intent
+from backend.providers.geocode_cache import geocode_cache
 from backend.providers.openstreetmap import OpenStreetMapProvider
-from backend.schemas import DirectionsResponse, PlacesResponse, Route
-from backend.services.search_service import normalize_photon_places
+from backend.schemas import DirectionsResponse, Route
+from backend.services.hot_routes import HotRouteStore, HotRouteTable
+from backend.services.proximity_cache import places_proximity_cache
+from backend.services.search_service import parse_photon_features, places_response_json
 from backend.utils.cache import TTLCache
+from backend.utils.errors import NoResultError
+from backend.utils.geometry import encode_polyline, simplify_line
+from backend.utils.metrics import stage_seconds, timed
+from backend.utils.serialization import EncodedResponse
+from backend.utils.shared_state import shared_state
+from backend.utils.throttle import get_throttle
 
 
 logger = logging.getLogger(__name__)
 
 provider = OpenStreetMapProvider()
-cache = TTLCache(ttl_seconds=60)
+cache = TTLCache(
+    ttl_seconds=RESPONSE_CACHE_TTL,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=RESPONSE_CACHE_MAX_BYTES,
+    stale_while_revalidate=RESPONSE_CACHE_STALE_TTL,
+    stale_if_error=RESPONSE_CACHE_STALE_IF_ERROR,
+    negative_ttl=NEGATIVE_CACHE_TTL,
+    negative_errors=(NoResultError,),
+)
+# Popular origin/destination pairs, routed ahead of time
+hot_routes = HotRouteTable(provider, HotRouteStore())
 
 
 def _normalize(value: str) -> str:
@@ -29,9 +59,41 @@ def build_directions_cache_key(intent) -> str:
     return f"get_directions|{_normalize(intent.origin)}|{_normalize(intent.destination)}"
 
 
+def build_geometry_cache_suffix(geometry: str, simplify_tolerance) -> str:
+    return f"{geometry}|{simplify_tolerance or ''}"
+
+
+def _route_tolerance(geometry: str, simplify_tolerance):
+    """
+    Douglas-Peucker tolerance to apply for `geometry`, or None.
+    """
+    if geometry == "simplified":
+        return simplify_tolerance or ROUTE_SIMPLIFY_TOLERANCE
+    if geometry == "polyline6":
+        return simplify_tolerance
+    return None
+
+
+def format_route_geometry(geometry: dict, mode: str, tolerance):
+    """
+    Convert an OSRM GeoJSON LineString into the requested output format.
+    Returns (geometry, geometry_format).
+    """
+    if mode in ("full", "overview"):
+        return geometry, "geojson"
+
+    coordinates = geometry["coordinates"]
+    if tolerance is not None:
+        coordinates = simplify_line(coordinates, tolerance)
+
+    if mode == "polyline6":
+        return encode_polyline(coordinates, precision=6), "polyline6"
+
+    return {"type": "LineString", "coordinates": coordinates}, "geojson"
+
+
 def enforce_direction_intent(message: str, intent):
     text = message.lower()
-    print(f"Message: {message}")
 
     movement_keywords = [
         "go to",
@@ -56,72 +118,249 @@ def enforce_direction_intent(message: str, intent):
     return intent
 
 
-async def handle_chat(message: str):
-    MAX_MESSAGE_LENGTH = 500
+async def _cached(cache_key: str, compute) -> EncodedResponse:
+    """
+    Per-process cache in front of the shared-state backend.
 
-    if len(message) > MAX_MESSAGE_LENGTH:
-        raise HTTPException(status_code=400, detail="Message too long")
+    Results are stored serialized (EncodedResponse), so hits are served
+    without re-encoding. Concurrent misses in this worker share one
+    computation; with a shared backend, other workers reuse the JSON body.
+    """
 
-    intent = await extract_intent(message)
-    intent = enforce_direction_intent(message, intent)
+    computed = False
 
-    print(intent)
-    if intent.intent == "find_places":
-        if not intent.query or not intent.location:
-            raise ValueError("Missing query or location")
+    async def load():
+        nonlocal computed
+        computed = True
 
-        cache_key = build_places_cache_key(intent)
-        cached = cache.get(cache_key)
-        if cached:
-            logger.debug("Cache hit (places): %s", cache_key)
-            return cached
+        if shared_state.shared:
+            with timed("shared_cache_lookup"):
+                raw = await shared_state.get(f"response:{cache_key}")
+            if raw is not None:
+                return EncodedResponse(raw)
+
+        result = await compute()
+        with timed("serialize"):
+            response = EncodedResponse.from_value(result)
 
-        raw_places = await provider.search_places(
+        if shared_state.shared:
+            await shared_state.set(
+                f"response:{cache_key}",
+                response.body,
+                ttl_seconds=RESPONSE_CACHE_TTL,
+            )
+        return response
+
+    start = time.perf_counter()
+    response = await cache.get_or_compute(cache_key, load)
+    if not computed:
+        # Served from this worker's cache (or a concurrent request's result)
+        stage_seconds.observe(time.perf_counter() - start, stage="cache_lookup")
+    return response
+
+
+async def _locate(location: str):
+    """
+    (lat, lon) of a search location, or None if it cannot be geocoded.
+    Only used to store results in the proximity cache, so any failure
+    (including a throttle rejection) is ignored.
+    """
+    try:
+        return await provider.geocode(location)
+    except Exception as e:
+        logger.debug("Could not locate %s for the proximity cache: %s", location, e)
+        return None
+
+
+async def _search_places(intent) -> bytes:
+    records = None
+    center = None
+
+    if places_proximity_cache is not None:
+        center = await geocode_cache.get(intent.location)
+        if center is not None:
+            with timed("proximity_lookup"):
+                records = places_proximity_cache.get(intent.query, *center, intent.limit)
+
+    if records is None:
+        search = provider.search_places(
             query=intent.query,
             location=intent.location,
             limit=intent.limit,
         )
 
-        places = normalize_photon_places(raw_places)
+        # The extra geocode doubles Photon requests for this search, so it is
+        # only sent when the throttle has room for both and one more request
+        # (never under the "public" profile's 2 concurrent requests)
+        if places_proximity_cache is not None and center is None and get_throttle("photon").has_capacity(3):
+            # Geocode alongside the search so storing the results adds no latency
+            raw_places, center = await asyncio.gather(search, _locate(intent.location))
+        else:
+            raw_places = await search
+
+        with timed("normalize"):
+            records = parse_photon_features(raw_places)
+
+        if center is not None:
+            places_proximity_cache.set(intent.query, *center, records)
+
+    # Serialized straight from the records, without pydantic models
+    return places_response_json(
+        f"{intent.query.title()} places near {intent.location}",
+        records,
+    )
+
+
+def _directions_response(intent, route_data: dict, geometry: str, tolerance) -> DirectionsResponse:
+    with timed("route_geometry"):
+        route_geometry, geometry_format = format_route_geometry(
+            route_data["geometry"],
+            geometry,
+            tolerance,
+        )
 
-        response = PlacesResponse(
-            intent="find_places",
-            summary=f"{intent.query.title()} places near {intent.location}",
-            places=places,
+    return DirectionsResponse(
+        intent="get_directions",
+        summary=f"Directions from {intent.origin} to {intent.destination}",
+        route=Route(
+            distance_meters=route_data["distance"],
+            duration_seconds=route_data["duration"],
+            geometry=route_geometry,
+            geometry_format=geometry_format,
+        ),
+    )
+
+
+async def _route_between(intent, origin_coords, destination_coords, geometry: str, tolerance) -> DirectionsResponse:
+    route_data = await provider.get_directions(
+        origin=origin_coords,
+        destination=destination_coords,
+        overview="simplified" if geometry == "overview" else "full",
+    )
+    return _directions_response(intent, route_data, geometry, tolerance)
+
+
+def _hot_route(intent, geometry: str):
+    if geometry == "overview":
+        # Only full geometries are precomputed, not OSRM's own overview
+        return None
+    return hot_routes.get(build_directions_cache_key(intent))
+
+
+async def _get_directions(intent, geometry: str, tolerance) -> DirectionsResponse:
+    route_data = _hot_route(intent, geometry)
+    if route_data is not None:
+        return _directions_response(intent, route_data, geometry, tolerance)
+
+    with timed("geocode"):
+        origin_coords, destination_coords = await provider.geocode_many(
+            [intent.origin, intent.destination]
         )
+    return await _route_between(intent, origin_coords, destination_coords, geometry, tolerance)
+
+
+def _directions_cache_key(intent, tolerance, geometry: str) -> str:
+    return f"{build_directions_cache_key(intent)}|{build_geometry_cache_suffix(geometry, tolerance)}"
 
-        cache.set(cache_key, response)
-        return response
 
-    if intent.intent == "get_directions":
+async def resolve_intent(message: str):
+    MAX_MESSAGE_LENGTH = 500
+
+    if len(message) > MAX_MESSAGE_LENGTH:
+        raise HTTPException(status_code=400, detail="Message too long")
+
+    with timed("intent"):
+        intent = await extract_intent(message)
+    if intent.confidence is None:
+        # Keyword correction only applies to LLM output
+        intent = enforce_direction_intent(message, intent)
+
+    logger.debug("Resolved intent: %s", intent)
+    if intent.intent == "find_places":
+        if not intent.query or not intent.location:
+            raise ValueError("Missing query or location")
+
+    elif intent.intent == "get_directions":
         if not intent.origin or not intent.destination:
             raise ValueError("Missing origin or destination")
 
-        cache_key = build_directions_cache_key(intent)
-        cached = cache.get(cache_key)
-        if cached:
-            logger.debug("Cache hit (directions): %s", cache_key)
-            return cached
+    else:
+        raise ValueError(f"Unsupported intent: {intent.intent}")
 
-        origin_coords = await provider.geocode(intent.origin)
-        destination_coords = await provider.geocode(intent.destination)
+    return intent
 
-        route_data = await provider.get_directions(
-            origin=origin_coords,
-            destination=destination_coords,
-        )
 
-        response = DirectionsResponse(
-            intent="get_directions",
-            summary=f"Directions from {intent.origin} to {intent.destination}",
-            route=Route(
-                distance_meters=route_data["distance"],
-                duration_seconds=route_data["duration"],
-                geometry=route_data["geometry"],
-            ),
-        )
+async def handle_chat(message: str, geometry: str = "full", simplify_tolerance=None):
+    intent = await resolve_intent(message)
 
-        cache.set(cache_key, response)
-        return response
+    if intent.intent == "find_places":
+        # Concurrent misses for the same key share one upstream computation
+        cache_key = build_places_cache_key(intent)
+        return await _cached(cache_key, lambda: _search_places(intent))
+
+    hot_routes.record(build_directions_cache_key(intent), intent.origin, intent.destination)
+
+    tolerance = _route_tolerance(geometry, simplify_tolerance)
+    return await _cached(
+        _directions_cache_key(intent, tolerance, geometry),
+        lambda: _get_directions(intent, geometry, tolerance),
+    )
 
-    raise ValueError(f"Unsupported intent: {intent.intent}")
+
+async def stream_chat(message: str, geometry: str = "full", simplify_tolerance=None):
+    """
+    Same work as handle_chat, yielding (event, payload) pairs as each
+    stage completes:
+
+    - ("intent", ...) as soon as the intent is extracted
+    - ("places", {...}) for place searches
+    - ("endpoints", {"origin": ..., "destination": ...}) once both ends are
+      geocoded (skipped when the route is already cached or precomputed)
+    - ("route", {...}) for directions
+    """
+    intent = await resolve_intent(message)
+    yield "intent", intent.model_dump(mode="json", exclude_none=True)
+
+    if intent.intent == "find_places":
+        cache_key = build_places_cache_key(intent)
+        response = await _cached(cache_key, lambda: _search_places(intent))
+        yield "places", response.json()
+        return
+
+    hot_routes.record(build_directions_cache_key(intent), intent.origin, intent.destination)
+
+    tolerance = _route_tolerance(geometry, simplify_tolerance)
+    cache_key = _directions_cache_key(intent, tolerance, geometry)
+
+    # Set by compute() once both ends are geocoded, so the event can go out
+    # while the route is still being fetched
+    endpoints = asyncio.get_running_loop().create_future()
+
+    async def compute():
+        route_data = _hot_route(intent, geometry)
+        if route_data is not None:
+            return _directions_response(intent, route_data, geometry, tolerance)
+
+        with timed("geocode"):
+            origin_coords, destination_coords = await provider.geocode_many(
+                [intent.origin, intent.destination]
+            )
+        endpoints.set_result((origin_coords, destination_coords))
+        return await _route_between(intent, origin_coords, destination_coords, geometry, tolerance)
+
+    # One cache lookup: compute() only runs on a miss
+    route = asyncio.ensure_future(_cached(cache_key, compute))
+    try:
+        await asyncio.wait({route, endpoints}, return_when=asyncio.FIRST_COMPLETED)
+        if endpoints.done():
+            origin_coords, destination_coords = endpoints.result()
+            yield "endpoints", {
+                "origin": {"name": intent.origin, "lat": origin_coords[0], "lon": origin_coords[1]},
+                "destination": {"name": intent.destination, "lat": destination_coords[0], "lon": destination_coords[1]},
+            }
+        response = await route
+    finally:
+        # Client went away mid-stream
+        route.cancel()
+
+    yield "route", response.json()
@@ -0,0 +1,276 @@
+# backend/services/hot_routes.py
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.config import (
+    HOT_ROUTES_MAX_AGE,
+    HOT_ROUTES_MIN_REQUESTS,
+    HOT_ROUTES_PATH,
+    HOT_ROUTES_REFRESH_AFTER,
+    HOT_ROUTES_REFRESH_INTERVAL,
+    HOT_ROUTES_TOP_K,
+    HOT_ROUTES_TRACK_MAX,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class HotRouteStore:
+    """
+    Precomputed routes in SQLite, keyed by directions cache key.
+
+    Like the geocode cache, the file survives restarts and is read by
+    every worker on the host.
+    """
+
+    def __init__(self, path: str = HOT_ROUTES_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,  # autocommit
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS hot_routes ("
+                " key TEXT PRIMARY KEY,"
+                " route TEXT NOT NULL,"
+                " refreshed_at REAL NOT NULL)"
+            )
+            self._conn = conn
+
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        """
+        (route, refreshed_at) or None.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT route, refreshed_at FROM hot_routes WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, route: dict):
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO hot_routes (key, route, refreshed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(route), time.time()),
+            )
+
+    def refreshed_at(self) -> Dict[str, float]:
+        with self._lock:
+            rows = self._connect().execute("SELECT key, refreshed_at FROM hot_routes").fetchall()
+        return dict(rows)
+
+    def delete_older_than(self, cutoff: float, keep: List[str]) -> int:
+        placeholders = ",".join("?" for _ in keep) or "''"
+        with self._lock:
+            cursor = self._connect().execute(
+                f"DELETE FROM hot_routes WHERE refreshed_at < ? AND key NOT IN ({placeholders})",
+                (cutoff, *keep),
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class HotRouteTable:
+    """
+    Serves popular origin/destination pairs without any upstream call.
+
+    Every directions request is counted per pair. A background job
+    periodically geocodes and routes the `top_k` most requested pairs into
+    the store and refreshes entries older than `refresh_after` seconds.
+    Counts are halved after each run so the table follows changes in traffic.
+    """
+
+    def __init__(
+        self,
+        provider,
+        store: HotRouteStore,
+        top_k: int = HOT_ROUTES_TOP_K,
+        min_requests: int = HOT_ROUTES_MIN_REQUESTS,
+        refresh_after: float = HOT_ROUTES_REFRESH_AFTER,
+        max_age: float = HOT_ROUTES_MAX_AGE,
+        track_max: int = HOT_ROUTES_TRACK_MAX,
+    ):
+        self._provider = provider
+        self._store = store
+        self.top_k = top_k
+        self.min_requests = min_requests
+        self.refresh_after = refresh_after
+        self.max_age = max_age
+        self.track_max = track_max
+
+        # key -> [count, origin, destination]
+        self._counts: Dict[str, list] = {}
+        # Keys present in the store, so most lookups skip SQLite entirely
+        self._stored: Optional[Set[str]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+        self.refresh_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_k > 0
+
+    def record(self, key: str, origin: str, destination: str):
+        if not self.enabled:
+            return
+
+        entry = self._counts.get(key)
+        if entry is None:
+            if len(self._counts) >= self.track_max:
+                self._prune()
+            self._counts[key] = [1, origin, destination]
+        else:
+            entry[0] += 1
+
+    def _prune(self):
+        # Forget the least requested half
+        keep = heapq.nlargest(self.track_max // 2, self._counts.items(), key=lambda item: item[1][0])
+        self._counts = dict(keep)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Stored route (distance, duration, full GeoJSON geometry) for `key`, or None.
+        SQLite is only read for keys known to be stored.
+        """
+        if not self.enabled:
+            return None
+
+        if self._stored is None:
+            # Routes stored by an earlier run or another worker
+            self._stored = set(self._store.refreshed_at())
+
+        if key not in self._stored:
+            self.misses += 1
+            return None
+
+        found = self._store.get(key)
+        if found is None or time.time() - found[1] > self.max_age:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return found[0]
+
+    def top_pairs(self) -> List[Tuple[str, str, str]]:
+        ranked = heapq.nlargest(self.top_k, self._counts.items(), key=lambda item: item[1][0])
+        return [
+            (key, origin, destination)
+            for key, (count, origin, destination) in ranked
+            if count >= self.min_requests
+        ]
+
+    async def refresh(self) -> int:
+        """
+        Route every hot pair that is missing or due for a refresh.
+        Returns the number of routes written.
+        """
+        pairs = self.top_pairs()
+        refreshed_at = self._store.refreshed_at()
+        now = time.time()
+        written = 0
+
+        # One pair at a time: user requests share the same upstream throttles
+        for key, origin, destination in pairs:
+            if now - refreshed_at.get(key, 0.0) < self.refresh_after:
+                continue
+
+            try:
+                origin_coords, destination_coords = await self._provider.geocode_many([origin, destination])
+                route = await self._provider.get_directions(
+                    origin=origin_coords,
+                    destination=destination_coords,
+                    overview="full",
+                )
+            except Exception as e:
+                self.refresh_failures += 1
+                logger.warning("Hot route refresh failed for %s: %s", key, e)
+                continue
+
+            self._store.set(
+                key,
+                {
+                    "distance": route["distance"],
+                    "duration": route["duration"],
+                    "geometry": route["geometry"],
+                },
+            )
+            written += 1
+
+        self._store.delete_older_than(now - self.max_age, keep=[key for key, _, _ in pairs])
+        self._stored = set(self._store.refreshed_at())
+
+        for entry in self._counts.values():
+            entry[0] //= 2
+        self._counts = {key: entry for key, entry in self._counts.items() if entry[0] > 0}
+
+        self.refreshed += written
+        return written
+
+    async def _refresh_forever(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Hot route refresh failed")
+
+    def start(self, interval: float = HOT_ROUTES_REFRESH_INTERVAL):
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._refresh_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._store.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tracked_pairs": len(self._counts),
+            "hot_pairs": len(self.top_pairs()) if self.enabled else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "refreshed": self.refreshed,
+            "refresh_failures": self.refresh_failures,
+        }
@@ -0,0 +1,88 @@
+# backend/services/proximity_cache.py
+
+from typing import List, Optional
+
+from backend.config import (
+    PLACES_PROXIMITY_MAX_ENTRIES,
+    PLACES_PROXIMITY_PRECISION,
+    PLACES_PROXIMITY_RADIUS,
+    PLACES_PROXIMITY_TTL,
+)
+from backend.providers.geocode_cache import normalize_place_name
+from backend.services.search_service import PlaceRecord
+from backend.utils import geohash
+from backend.utils.cache import TTLCache
+
+
+class ProximityCache:
+    """
+    Place search results keyed by (query, geohash cell of the location).
+
+    A search near a location that was not searched before can still be
+    answered from results cached for the same query in its cell or the 8
+    surrounding cells, filtered to `radius_meters` and re-ranked by
+    distance. If fewer than `limit` cached places are in range it is a
+    miss.
+    """
+
+    def __init__(
+        self,
+        precision: int,
+        radius_meters: float,
+        ttl_seconds: int,
+        max_entries: int,
+    ):
+        self.precision = precision
+        self.radius = radius_meters
+        self._cache = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, query: str, cell: str) -> str:
+        return f"{normalize_place_name(query)}|{cell}"
+
+    def get(self, query: str, lat: float, lon: float, limit: int) -> Optional[List[PlaceRecord]]:
+        cell = geohash.encode(lat, lon, self.precision)
+
+        candidates = {}
+        for neighbor in geohash.neighbors(cell):
+            for record in self._cache.get(self._key(query, neighbor)) or ():
+                distance = geohash.distance_meters(lat, lon, record.lat, record.lon)
+                if distance <= self.radius:
+                    # The same place may be cached under several cells
+                    candidates[(record.name, record.lat, record.lon)] = (distance, record)
+
+        if len(candidates) < limit:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        ranked = sorted(candidates.values(), key=lambda item: item[0])
+        return [record for _, record in ranked[:limit]]
+
+    def set(self, query: str, lat: float, lon: float, records: List[PlaceRecord]):
+        if records:
+            self._cache.set(self._key(query, geohash.encode(lat, lon, self.precision)), records)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "precision": self.precision,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+places_proximity_cache = (
+    ProximityCache(
+        precision=PLACES_PROXIMITY_PRECISION,
+        radius_meters=PLACES_PROXIMITY_RADIUS,
+        ttl_seconds=PLACES_PROXIMITY_TTL,
+        max_entries=PLACES_PROXIMITY_MAX_ENTRIES,
+    )
+    if PLACES_PROXIMITY_PRECISION
+    else None
+)
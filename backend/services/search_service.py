@@ -1,5 +1,9 @@
 # backend/services/search_service.py
+from typing import List
+
+from backend.providers.geocode_cache import geocode_cache
 from backend.schemas import Place
+from backend.utils.serialization import dumps
 
 
 def normalize_osm_places(raw_places):
@@ -15,49 +19,92 @@ def normalize_osm_places(raw_places):
             lat=lat,
             lon=lon,
             address=name,
-            map_url=f"https://www.openstreetmap.org/?mlat={lat}&mlon={lon}#map=18/{lat}/{lon}",
+            map_url=osm_map_url(lat, lon),
         )
         places.append(place)
 
     return places
 
 
-def normalize_photon_places(features):
-    places = []
+def osm_map_url(lat: float, lon: float) -> str:
+    return f"https://www.openstreetmap.org/?mlat={lat}&mlon={lon}#map=18/{lat}/{lon}"
+
+
+class PlaceRecord:
+    """
+    Lightweight place parsed from a Photon feature; `to_dict()` matches
+    the `Place` schema.
+    """
+
+    __slots__ = ("name", "lat", "lon", "address")
+
+    def __init__(self, name: str, lat: float, lon: float, address: str):
+        self.name = name
+        self.lat = lat
+        self.lon = lon
+        self.address = address
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "lat": self.lat,
+            "lon": self.lon,
+            "address": self.address,
+            "map_url": osm_map_url(self.lat, self.lon),
+        }
+
+
+def parse_photon_features(features) -> List[PlaceRecord]:
+    """
+    Photon GeoJSON features -> PlaceRecords, skipping features without
+    a valid [lon, lat] point.
+    """
+    records = []
 
     for feature in features:
-        props = feature.get("properties", {})
-        geometry = feature.get("geometry", {})
+        props = feature.get("properties") or {}
+        coords = (feature.get("geometry") or {}).get("coordinates")
 
-        coords = geometry.get("coordinates", [])
-        if len(coords) != 2:
+        if not isinstance(coords, list) or len(coords) != 2:
+            continue
+        try:
+            lon, lat = float(coords[0]), float(coords[1])
+        except (TypeError, ValueError):
+            continue
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
             continue
-
-        lon, lat = coords
 
         name = props.get("name") or props.get("street") or props.get("city") or "Unknown place"
 
-        address_parts = [
-            props.get("street"),
-            props.get("city"),
-            props.get("country"),
-        ]
+        address_parts = (props.get("street"), props.get("city"), props.get("country"))
         address = ", ".join([p for p in address_parts if p])
 
-        places.append(
-            Place(
-                name=name,
-                lat=lat,
-                lon=lon,
-                address=address or name,
-                map_url=f"https://www.openstreetmap.org/?mlat={lat}&mlon={lon}#map=18/{lat}/{lon}",
-            )
-        )
+        records.append(PlaceRecord(name, lat, lon, address or name))
+
+    return records
 
-    return places
+
+def normalize_photon_places(features) -> List[Place]:
+    return [Place(**record.to_dict()) for record in parse_photon_features(features)]
+
+
+def places_response_json(summary: str, records: List[PlaceRecord]) -> bytes:
+    """
+    JSON body of a PlacesResponse, built without pydantic models.
+    """
+    payload = {
+        "intent": "find_places",
+        "summary": summary,
+        "places": [record.to_dict() for record in records],
+    }
+    return dumps(payload)
 
 
 async def geocode_first(provider, query: str):
+    cached = await geocode_cache.get(query)
+    if cached:
+        return cached
+
     results = await provider.search_places(query=query, location="", limit=1)
     if not results:
         raise ValueError(f"Could not geocode location: {query}")
@@ -65,4 +112,6 @@ async def geocode_first(provider, query: str):
     feature = results[0]
     coords = feature["geometry"]["coordinates"]
     lon, lat = coords
+
+    await geocode_cache.set(query, (lat, lon))
     return lat, lon
@@ -1,25 +1,314 @@
+import asyncio
+import logging
+import sys
 import time
-from typing import Any, Dict, Tuple
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Type
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    # Serialized size of a pydantic model is a cheap, stable proxy
+    dump_json = getattr(value, "model_dump_json", None)
+    if dump_json is not None:
+        return len(dump_json())
+
+    if isinstance(value, (bytes, str)):
+        return len(value)
+
+    return sys.getsizeof(value)
+
+
+class _Negative:
+    """
+    Cached failure: `get_or_compute` raises a copy of it until it expires.
+
+    Only the exception's type, args and attributes are kept, so each hit
+    raises a fresh instance with its own traceback and context.
+    """
+
+    __slots__ = ("error_type", "args", "attributes")
+
+    def __init__(self, error: BaseException):
+        self.error_type = type(error)
+        self.args = error.args
+        self.attributes = dict(vars(error))
+
+    def error(self) -> BaseException:
+        error = self.error_type(*self.args)
+        vars(error).update(self.attributes)
+        return error
 
 
 class TTLCache:
-    def __init__(self, ttl_seconds: int = 60):
+    """
+    In-process LRU cache with per-entry TTL.
+
+    - bounded by entry count and (estimated) bytes, evicting least recently used
+    - expired entries are dropped on read and by a periodic background sweep
+    - `get_or_compute` coalesces concurrent misses for the same key into a
+      single computation (single-flight)
+
+    `get_or_compute` can additionally:
+
+    - serve an entry up to `stale_while_revalidate` seconds past its TTL
+      while refreshing it in the background
+    - serve an entry up to `stale_if_error` seconds past its TTL when
+      recomputing it fails
+    - cache `negative_errors` raised by the factory for `negative_ttl` seconds
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 60,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        negative_ttl: float = 0.0,
+        negative_errors: Tuple[Type[BaseException], ...] = (),
+    ):
         self.ttl = ttl_seconds
-        self._store: Dict[str, Tuple[float, Any]] = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.negative_ttl = negative_ttl
+        self.negative_errors = negative_errors
 
-    def get(self, key: str):
+        # key -> (expires_at, size, value), ordered from least to most recently used.
+        # Entries are kept for `_stale_window` seconds past expires_at.
+        self._store: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._stale_window = max(stale_while_revalidate, stale_if_error)
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._refreshes: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.stale_hits = 0
+        self.stale_on_error = 0
+        self.negative_hits = 0
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def _delete(self, key: str):
+        _, size, _ = self._store.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key: str):
+        """
+        (value, seconds past expiry) for a retained entry, else None.
+        Age is <= 0 while the entry is fresh.
+        """
         entry = self._store.get(key)
-        if not entry:
+        if entry is None:
             return None
 
-        expires_at, value = entry
-        if time.time() > expires_at:
-            # expired
-            del self._store[key]
+        expires_at, _, value = entry
+        age = time.monotonic() - expires_at
+        if age > (0 if isinstance(value, _Negative) else self._stale_window):
+            self._delete(key)
             return None
 
-        return value
+        self._store.move_to_end(key)
+        return value, age
+
+    def get(self, key: str):
+        """
+        Fresh cached value for `key`, or None. Never returns stale entries.
+        """
+        found = self._lookup(key)
+        if found is None or found[1] > 0 or isinstance(found[0], _Negative):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return found[0]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        if key in self._store:
+            self._delete(key)
+
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        ttl = self.ttl if ttl_seconds is None else ttl_seconds
+        self._store[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+
+        while len(self._store) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._store))
+            self._delete(oldest)
+            self.evictions += 1
+
+    def sweep(self) -> int:
+        """
+        Drop every entry past its TTL and stale window. Returns the number removed.
+        """
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (expires_at, _, value) in self._store.items()
+            if now - expires_at > (0 if isinstance(value, _Negative) else self._stale_window)
+        ]
+        for key in expired:
+            self._delete(key)
+        return len(expired)
+
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[Any]]):
+        """
+        Return the cached value for `key`, or await `factory()` and cache its result.
+
+        While a computation for `key` is in flight, other callers await the same
+        result instead of starting their own. Failures are propagated to every
+        waiter and, unless they are `negative_errors`, are not cached.
+        """
+        while True:
+            fallback = _MISSING
+            found = self._lookup(key)
+
+            if found is not None:
+                value, age = found
+                if isinstance(value, _Negative):
+                    self.hits += 1
+                    self.negative_hits += 1
+                    raise value.error()
+
+                if age <= 0:
+                    self.hits += 1
+                    return value
+
+                if age <= self.stale_while_revalidate:
+                    self.hits += 1
+                    self.stale_hits += 1
+                    self._refresh(key, factory)
+                    return value
+
+                if age <= self.stale_if_error:
+                    fallback = value
+
+            self.misses += 1
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    # The leading request was cancelled; try again ourselves
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return await self._compute(key, factory, future, fallback)
+
+    async def _compute(self, key: str, factory, future: asyncio.Future, fallback=_MISSING):
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            if isinstance(e, self.negative_errors) and self.negative_ttl > 0:
+                self.set(key, _Negative(e), ttl_seconds=self.negative_ttl)
+            elif isinstance(e, Exception) and fallback is not _MISSING:
+                logger.warning("Serving stale cache entry for %s: %s", key, e)
+                self.stale_on_error += 1
+                future.set_result(fallback)
+                return fallback
+
+            future.set_exception(e)
+            # Mark as retrieved so an unawaited future does not log a warning
+            future.exception()
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refresh(self, key: str, factory):
+        """
+        Recompute a stale entry in the background, at most once at a time per key.
+        """
+        if key in self._inflight:
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        self.refreshes += 1
+
+        async def run():
+            try:
+                await self._compute(key, factory, future)
+            except Exception as e:
+                # The stale entry stays in place until its window runs out
+                logger.warning("Background refresh of %s failed: %s", key, e)
+
+        task = loop.create_task(run())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _sweep_forever(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def start_sweeper(self, interval: float):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever(interval))
+
+    async def stop_sweeper(self):
+        # Background refreshes would outlive the upstream clients on shutdown
+        for task in list(self._refreshes):
+            task.cancel()
+
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
 
-    def set(self, key: str, value: Any):
-        expires_at = time.time() + self.ttl
-        self._store[key] = (expires_at, value)
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+            "stale_on_error": self.stale_on_error,
+            "negative_hits": self.negative_hits,
+            "refreshes": self.refreshes,
+            "in_flight": len(self._inflight),
+        }
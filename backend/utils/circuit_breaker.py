@@ -0,0 +1,239 @@
+# backend/utils/circuit_breaker.py
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+from backend.config import CIRCUIT_BREAKER, HEDGE_DEFAULT_DELAY, HEDGE_MIN_DELAY
+from backend.utils.errors import UpstreamError
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(UpstreamError):
+    """
+    Raised without calling the upstream while its circuit is open.
+
+    Mapped to HTTP 503 with a Retry-After header by the API layer.
+    """
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single upstream endpoint.
+
+    Keeps the outcome of the last `window` calls. Once at least `min_calls`
+    are recorded and `failure_rate` of them failed (UpstreamError) or took
+    longer than `slow_call_seconds`, the circuit opens: calls fail fast with
+    CircuitOpenError for `open_seconds`. Then a single trial call is let
+    through (half-open); it closes the circuit on success and reopens it
+    otherwise.
+
+    Other errors (no result, local throttling) say nothing about the
+    upstream's health and are not recorded. A call cancelled after at least
+    the hedging delay (another upstream answered first) is recorded with the
+    time it had taken so far, so slow calls still count.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        open_seconds: float,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failed or slow
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        # Durations of recent successful calls, for the hedging delay
+        self._latencies: Deque[float] = deque(maxlen=100)
+
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def check(self):
+        """
+        Raise CircuitOpenError if a call would be refused right now, without
+        taking the half-open trial. Lets callers fail fast before queueing.
+        """
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} is unavailable, try again later", retry_after=remaining)
+
+        elif self.state == HALF_OPEN and self._trial_in_flight:
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} is unavailable, try again later", retry_after=1.0)
+
+    def _admit(self):
+        self.check()
+
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = True
+
+    def _record(self, failed: bool, elapsed: float):
+        slow = elapsed > self.slow_call_seconds
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow and not failed
+        if not failed:
+            self._latencies.append(elapsed)
+
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+            if failed or slow:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append(failed or slow)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) >= self.failure_rate * len(self._outcomes):
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+
+    @asynccontextmanager
+    async def call(self):
+        """
+        Guard one upstream call; raises CircuitOpenError while open.
+        """
+        self._admit()
+        started = time.monotonic()
+        try:
+            yield
+        except UpstreamError:
+            self._record(True, time.monotonic() - started)
+            raise
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - started
+            if elapsed >= self.hedge_delay():
+                # Abandoned for a hedged call: it took at least this long
+                self._record(False, elapsed)
+            elif self.state == HALF_OPEN:
+                self._trial_in_flight = False
+            raise
+        except BaseException:
+            if self.state == HALF_OPEN:
+                # Inconclusive trial: let the next call try again
+                self._trial_in_flight = False
+            raise
+        else:
+            self._record(False, time.monotonic() - started)
+
+    def hedge_delay(self) -> float:
+        """
+        p95 of recent successful call durations (HEDGE_DEFAULT_DELAY until
+        enough calls were seen), at least HEDGE_MIN_DELAY.
+        """
+        if len(self._latencies) < 20:
+            return HEDGE_DEFAULT_DELAY
+        ordered = sorted(self._latencies)
+        return max(HEDGE_MIN_DELAY, ordered[int(0.95 * (len(ordered) - 1))])
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "opened": self.opened,
+            "hedge_delay_ms": round(1000 * self.hedge_delay(), 3),
+        }
+
+
+async def hedged(primary, secondary, delay: float, retry_on=(UpstreamError,)):
+    """
+    Await `primary()`; if it has not succeeded after `delay` seconds (or
+    fails sooner with one of `retry_on`), also start `secondary()`. Returns
+    the first successful result and cancels the other call. When both fail
+    the primary's error is raised.
+    """
+    first = asyncio.ensure_future(primary())
+    second: Optional[asyncio.Future] = None
+    errors = {}
+
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if first in done:
+            error = first.exception()
+            if error is None:
+                return first.result()
+            if not isinstance(error, retry_on):
+                raise error
+            errors[first] = error
+
+        second = asyncio.ensure_future(secondary())
+        pending = {second} if errors else {first, second}
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result()
+                if not isinstance(error, retry_on):
+                    raise error
+                errors[task] = error
+
+        raise errors.get(first) or errors[second]
+    finally:
+        for task in (first, second):
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Mark the loser's error as retrieved
+                task.exception()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the process-wide circuit breaker for endpoint `name`
+    (all configured from CIRCUIT_BREAKER).
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name, **CIRCUIT_BREAKER)
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_stats() -> dict:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,31 @@
+# backend/utils/errors.py
+
+
+class ServiceOverloadedError(Exception):
+    """
+    Raised when a request is shed because a dependency is at capacity.
+
+    Mapped to HTTP 503 with a Retry-After header by the API layer.
+    """
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class UpstreamError(ValueError):
+    """
+    Raised when an upstream service fails (timeout, connection error, 5xx).
+
+    Responses cached before the failure may still be served instead.
+    Mapped to HTTP 502 by the API layer.
+    """
+
+
+class NoResultError(ValueError):
+    """
+    Raised when an upstream answers but has nothing for the request
+    (no route between two points, unknown place name).
+
+    Such answers are stable, so they are cached briefly like results.
+    """
@@ -0,0 +1,93 @@
+# backend/utils/geohash.py
+
+import math
+from typing import List, Tuple
+
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def encode(lat: float, lon: float, precision: int) -> str:
+    """
+    Geohash of (lat, lon) with `precision` characters
+    (5 ~ 4.9 x 4.9 km, 6 ~ 1.2 x 0.6 km, 7 ~ 153 x 153 m).
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, min_lon, max_lat, max_lon) of a geohash cell.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def neighbors(geohash: str) -> List[str]:
+    """
+    The cell itself followed by its (up to) 8 surrounding cells.
+    """
+    min_lat, min_lon, max_lat, max_lon = bounds(geohash)
+    height, width = max_lat - min_lat, max_lon - min_lon
+    center_lat, center_lon = (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+    cells = [geohash]
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            lat = center_lat + dy * height
+            if (dx or dy) and -90.0 < lat < 90.0:
+                lon = (center_lon + dx * width + 180.0) % 360.0 - 180.0
+                cell = encode(lat, lon, len(geohash))
+                if cell not in cells:
+                    cells.append(cell)
+    return cells
+
+
+def distance_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Equirectangular approximation; accurate to well under 1% at city scale.
+    """
+    x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return math.hypot(x, y) * EARTH_RADIUS_METERS
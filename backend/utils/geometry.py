@@ -0,0 +1,89 @@
+# backend/utils/geometry.py
+
+import math
+from typing import List, Sequence
+
+import numpy as np
+
+
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def _project(points: np.ndarray) -> np.ndarray:
+    """
+    [lon, lat] degrees -> local equirectangular x/y in meters.
+
+    Accurate enough for simplification tolerances over a single route.
+    """
+    lat0 = math.radians(float(points[:, 1].mean()))
+    radians = np.radians(points)
+    x = radians[:, 0] * math.cos(lat0) * EARTH_RADIUS_METERS
+    y = radians[:, 1] * EARTH_RADIUS_METERS
+    return np.column_stack((x, y))
+
+
+def simplify_line(coordinates: Sequence[Sequence[float]], tolerance_meters: float) -> List[List[float]]:
+    """
+    Douglas-Peucker simplification of a GeoJSON [lon, lat] line.
+
+    Each split step measures all points of a span against its chord in one
+    vectorized NumPy operation; spans are processed from an explicit stack
+    instead of recursing.
+    """
+    points = np.asarray(coordinates, dtype=float)
+    n = len(points)
+    if n <= 2:
+        return points.tolist()
+
+    xy = _project(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        a = xy[start]
+        chord = xy[end] - a
+        span = xy[start + 1 : end] - a
+        length = math.hypot(chord[0], chord[1])
+
+        if length == 0.0:
+            distances = np.hypot(span[:, 0], span[:, 1])
+        else:
+            distances = np.abs(chord[0] * span[:, 1] - chord[1] * span[:, 0]) / length
+
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance_meters:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return points[keep].tolist()
+
+
+def encode_polyline(coordinates: Sequence[Sequence[float]], precision: int = 6) -> str:
+    """
+    Encode GeoJSON [lon, lat] coordinates as a Google-style polyline
+    (precision 6 = OSRM's "polyline6"), which stores lat before lon.
+    """
+    points = np.asarray(coordinates, dtype=float)
+    if len(points) == 0:
+        return ""
+
+    scaled = np.round(points[:, ::-1] * 10**precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    # Zig-zag: small negative numbers become small positive ones
+    values = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+
+    chars = []
+    for value in values.tolist():
+        while value >= 0x20:
+            chars.append(chr((0x20 | (value & 0x1F)) + 63))
+            value >>= 5
+        chars.append(chr(value + 63))
+
+    return "".join(chars)
@@ -0,0 +1,139 @@
+# backend/utils/http.py
+
+import time
+from typing import Dict
+
+import httpx
+
+from backend.config import HTTP_POOLS
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps httpx's default transport to record pool usage.
+
+    Pool wait time is measured from the moment a request enters the
+    transport until httpcore emits its first trace event, which only
+    happens once a connection has been assigned to the request.
+    """
+
+    def __init__(self, **kwargs):
+        self._transport = httpx.AsyncHTTPTransport(**kwargs)
+        self.requests = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _record_wait(self, waited: float):
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        assigned = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name, info):
+            nonlocal assigned
+            if not assigned:
+                assigned = True
+                self._record_wait(time.perf_counter() - started)
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    def stats(self) -> dict:
+        # httpx does not expose its httpcore pool publicly
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+
+        idle = sum(1 for c in connections if c.is_idle())
+        active = sum(1 for c in connections if not c.is_idle() and not c.is_closed())
+
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "active_connections": active,
+            "idle_connections": idle,
+            "avg_wait_ms": round(1000 * self.total_wait / self.requests, 3) if self.requests else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 3),
+        }
+
+
+class HTTPClientPool:
+    """
+    Registry of long-lived httpx.AsyncClient instances, one per upstream.
+
+    Clients are created on application startup and closed on shutdown.
+    `get()` also creates a client lazily so scripts and tests that never
+    run the FastAPI lifespan keep working.
+    """
+
+    def __init__(self, config: Dict[str, dict] = HTTP_POOLS):
+        self._config = config
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, InstrumentedTransport] = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        if name not in self._config:
+            raise ValueError(f"Unknown upstream pool: {name}")
+
+        cfg = self._config[name]
+
+        transport = InstrumentedTransport(
+            http2=cfg["http2"],
+            limits=httpx.Limits(
+                max_connections=cfg["max_connections"],
+                max_keepalive_connections=cfg["max_keepalive_connections"],
+                keepalive_expiry=cfg["keepalive_expiry"],
+            ),
+        )
+
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                connect=5.0,
+                read=cfg["read_timeout"],
+                write=5.0,
+                pool=5.0,
+            ),
+        )
+
+        self._transports[name] = transport
+        self._clients[name] = client
+        return client
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+        return client
+
+    async def start(self):
+        for name in self._config:
+            self.get(name)
+
+    async def close(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._transports.clear()
+
+        for client in clients:
+            await client.aclose()
+
+    def stats(self) -> dict:
+        return {name: transport.stats() for name, transport in self._transports.items()}
+
+
+http_clients = HTTPClientPool()
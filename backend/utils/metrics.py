@@ -0,0 +1,114 @@
+# backend/utils/metrics.py
+
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """
+    Prometheus-style histogram with a fixed label set.
+
+    Observations only increment a per-bucket counter; cumulative bucket
+    counts are computed when the metrics are rendered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+        # label values -> (counts per bucket incl. +Inf, [sum])
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0])
+            self._series[key] = series
+
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        for key, (counts, total) in sorted(self._series.items()):
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = ",".join(labels + [f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+
+            suffix = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total[0]}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+
+        return lines
+
+    def summary(self) -> dict:
+        """
+        Count and mean (ms) per label set, for /stats.
+        """
+        result = {}
+        for key, (counts, total) in sorted(self._series.items()):
+            count = sum(counts)
+            result["|".join(key)] = {
+                "count": count,
+                "avg_ms": round(1000 * total[0] / count, 3) if count else 0.0,
+            }
+        return result
+
+
+stage_seconds = Histogram(
+    "directio_stage_duration_seconds",
+    "Time spent in each request-handling stage.",
+    labelnames=("stage",),
+)
+
+request_seconds = Histogram(
+    "directio_request_duration_seconds",
+    "HTTP request latency until response headers are sent.",
+    labelnames=("method", "path", "status"),
+)
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Record the duration of the enclosed block under `stage`,
+    whether it completes or raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, stage=stage)
+
+
+def render_metrics() -> str:
+    lines = stage_seconds.render() + request_seconds.render()
+    return "\n".join(lines) + "\n"
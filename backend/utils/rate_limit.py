@@ -1,22 +1,81 @@
 import time
-from collections import defaultdict
+from typing import Dict, Optional, Tuple
 
 
 class SimpleRateLimiter:
+    """
+    Token-bucket rate limiter.
+
+    Each key may make `max_requests` requests per `window_seconds`; tokens
+    refill continuously, so a key never waits a whole window after a burst.
+    State is a single (tokens, last_seen) pair per key. A key idle for a full
+    window is back at full capacity, so it is dropped by periodic eviction
+    without changing behaviour.
+    """
+
     def __init__(self, max_requests: int, window_seconds: int):
         self.max_requests = max_requests
         self.window = window_seconds
-        self.requests = defaultdict(list)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._next_eviction = time.monotonic() + window_seconds
+
+    def __len__(self) -> int:
+        return len(self._buckets)
 
-    def allow(self, key: str) -> bool:
-        now = time.time()
-        window_start = now - self.window
+    def allow(self, key: str, max_requests: Optional[int] = None) -> bool:
+        """
+        `max_requests` overrides the default limit for this key (e.g. the
+        per-API-key `rate_limit`).
+        """
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self.evict_idle(now)
 
-        timestamps = self.requests[key]
-        self.requests[key] = [t for t in timestamps if t > window_start]
+        capacity = max_requests or self.max_requests
+        bucket = self._buckets.get(key)
 
-        if len(self.requests[key]) >= self.max_requests:
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens, last_seen = bucket
+            refill = (now - last_seen) * capacity / self.window
+            tokens = min(capacity, tokens + refill)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
             return False
 
-        self.requests[key].append(now)
+        self._buckets[key] = (tokens - 1, now)
         return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Drop keys idle for at least one window. Returns the number removed.
+        """
+        now = time.monotonic() if now is None else now
+        idle = [key for key, (_, last_seen) in self._buckets.items() if now - last_seen >= self.window]
+        for key in idle:
+            del self._buckets[key]
+
+        self._next_eviction = now + self.window
+        return len(idle)
+
+
+class SharedRateLimiter:
+    """
+    Token-bucket limiter whose state lives in a shared-state backend
+    (see backend.utils.shared_state), so limits hold across workers.
+    """
+
+    def __init__(self, name: str, max_requests: int, window_seconds: int, backend):
+        self.name = name
+        self.max_requests = max_requests
+        self.window = window_seconds
+        self._backend = backend
+
+    async def allow(self, key: str, max_requests: Optional[int] = None) -> bool:
+        return await self._backend.take_token(
+            f"ratelimit:{self.name}:{key}",
+            capacity=max_requests or self.max_requests,
+            window_seconds=self.window,
+        )
@@ -0,0 +1,53 @@
+# backend/utils/request_context.py
+
+import logging
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Accept caller-supplied IDs only if they are short and header/log safe
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """
+    Reuse an upstream request ID (e.g. from a reverse proxy) when it is
+    well-formed, otherwise generate one.
+    """
+    if incoming and _VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Adds `request_id` to every log record so formats can use %(request_id)s.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+def configure_logging(level: int = logging.INFO):
+    """
+    Log to stderr with the current request ID on every line. Leaves an
+    existing logging setup in place, only adding the request ID filter.
+    """
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s",
+    )
+
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(f, RequestIdFilter) for f in handler.filters):
+            handler.addFilter(RequestIdFilter())
+
+    # httpx logs every upstream request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
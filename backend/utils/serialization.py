@@ -0,0 +1,108 @@
+# backend/utils/serialization.py
+
+import gzip
+import hashlib
+import json
+from typing import Dict, Optional
+
+from backend.config import RESPONSE_BROTLI_QUALITY, RESPONSE_COMPRESSION_MIN_BYTES, RESPONSE_GZIP_LEVEL
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: responses are offered gzip-only
+    brotli = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Compact UTF-8 JSON, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _compress(body: bytes) -> Dict[str, bytes]:
+    if len(body) < RESPONSE_COMPRESSION_MIN_BYTES:
+        # Headers would outweigh the savings
+        return {}
+
+    variants = {"gzip": gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return variants
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class EncodedResponse:
+    """
+    A response serialized once: JSON body, ETag, and compressed variants.
+
+    Cached as-is, so cache hits are served without re-encoding or
+    re-compressing anything.
+    """
+
+    __slots__ = ("body", "etag", "variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        # Weak: the same ETag covers every content-coding of the body
+        self.etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.variants = _compress(body)
+
+    @classmethod
+    def from_value(cls, value) -> "EncodedResponse":
+        """
+        Wrap pre-serialized bytes or a pydantic model.
+        """
+        if isinstance(value, EncodedResponse):
+            return value
+        if isinstance(value, bytes):
+            return cls(value)
+        return cls(value.model_dump_json().encode())
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+    def json(self):
+        return json.loads(self.body)
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        opaque = self.etag[2:]
+        return "*" in tags or any(tag.removeprefix("W/") == opaque for tag in tags)
+
+    def negotiate(self, accept_encoding: Optional[str]):
+        """
+        (body, content-encoding or None) for the client's Accept-Encoding.
+        """
+        accepted = _accepted_encodings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in self.variants and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+                return self.variants[coding], coding
+        return self.body, None
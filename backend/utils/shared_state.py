@@ -0,0 +1,126 @@
+# backend/utils/shared_state.py
+
+from typing import Dict, Optional
+
+from backend.config import SHARED_STATE_URL
+from backend.utils.cache import TTLCache
+from backend.utils.rate_limit import SimpleRateLimiter
+
+
+class InMemoryBackend:
+    """
+    Process-local state. Correct for a single worker; with several
+    workers each one enforces its own limits and keeps its own cache.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self._limiters: Dict[float, SimpleRateLimiter] = {}
+        self._values = TTLCache(max_entries=4096)
+
+    async def take_token(self, key: str, capacity: int, window_seconds: float) -> bool:
+        limiter = self._limiters.get(window_seconds)
+        if limiter is None:
+            limiter = SimpleRateLimiter(max_requests=capacity, window_seconds=window_seconds)
+            self._limiters[window_seconds] = limiter
+        return limiter.allow(key, max_requests=capacity)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._values.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        self._values.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def close(self):
+        pass
+
+
+# Token bucket evaluated atomically inside Redis, using the server clock so
+# that all workers agree on time. Idle buckets expire after one window.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + (now - tonumber(bucket[2])) * capacity / window)
+end
+
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return allowed
+"""
+
+
+class RedisBackend:
+    """
+    State shared by every worker through a Redis-compatible server
+    (Redis, Valkey, KeyDB, ...), over TCP or a local unix socket.
+
+    Requires the optional `redis` package, unless an already connected
+    `redis.asyncio`-compatible `client` is passed in.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "directio:", client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    f"SHARED_STATE_URL={url} requires the 'redis' package (pip install redis)"
+                ) from e
+
+            client = redis.from_url(url)
+
+        self._redis = client
+        self._prefix = prefix
+        self._token_bucket = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def take_token(self, key: str, capacity: int, window_seconds: float) -> bool:
+        allowed = await self._token_bucket(
+            keys=[self._prefix + key],
+            args=[capacity, window_seconds],
+        )
+        return bool(allowed)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        await self._redis.set(self._prefix + key, value, px=int(ttl_seconds * 1000))
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_backend(url: str):
+    """
+    "memory://" -> InMemoryBackend
+    "redis://host:6379/0", "rediss://...", "unix:///run/redis.sock" -> RedisBackend
+    """
+    scheme = url.split("://", 1)[0]
+
+    if scheme == "memory":
+        return InMemoryBackend()
+
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+
+    raise ValueError(f"Unsupported SHARED_STATE_URL: {url}")
+
+
+shared_state = create_backend(SHARED_STATE_URL)
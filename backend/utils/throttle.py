@@ -0,0 +1,182 @@
+# backend/utils/throttle.py
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+from backend.config import UPSTREAM_THROTTLES
+from backend.utils.errors import ServiceOverloadedError
+
+
+class AsyncThrottle:
+    """
+    Async throttle for a single upstream host.
+
+    Combines a token bucket (`rate` requests/second, bursts up to `burst`)
+    with a cap on concurrent requests. Callers that cannot proceed wait in
+    strict FIFO order; a caller still waiting after `max_wait` seconds is
+    rejected with ServiceOverloadedError instead of piling up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        max_wait: float,
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.granted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _can_proceed(self) -> bool:
+        return self._in_flight < self.max_concurrency and self._tokens >= 1
+
+    def _take(self):
+        self._tokens -= 1
+        self._in_flight += 1
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self):
+        """
+        Hand free slots to waiters in arrival order.
+        """
+        self._refill()
+        loop = asyncio.get_running_loop()
+
+        if self._timer is not None and self._timer_loop is not loop:
+            # Scheduled on a loop that has gone away (e.g. a previous asyncio.run)
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.done() or waiter.get_loop() is not loop:
+                # Timed out or cancelled while queued, or left by an old loop
+                self._waiters.popleft()
+                continue
+
+            if self._in_flight >= self.max_concurrency:
+                # A release will dispatch again
+                return
+
+            if self._tokens < 1:
+                if self._timer is None:
+                    delay = (1 - self._tokens) / self.rate
+                    self._timer = loop.call_later(delay, self._on_timer)
+                    self._timer_loop = loop
+                return
+
+            self._waiters.popleft()
+            self._take()
+            waiter.set_result(None)
+
+    def has_capacity(self, requests: int = 1) -> bool:
+        """
+        Whether `requests` more requests would start right now, without queueing.
+        """
+        self._refill()
+        return (
+            not any(not w.done() for w in self._waiters)
+            and self._in_flight + requests <= self.max_concurrency
+            and self._tokens >= requests
+        )
+
+    async def acquire(self):
+        self._refill()
+
+        if not self._waiters and self._can_proceed():
+            self._take()
+            self.granted += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._dispatch()
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServiceOverloadedError(
+                f"{self.name} is busy, try again later",
+                retry_after=self.max_wait,
+            )
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted just as we were cancelled; give it back
+                self.release()
+            raise
+
+        waited = time.monotonic() - started
+        self.granted += 1
+        self.total_wait += waited
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    def release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": sum(1 for w in self._waiters if not w.done()),
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(1000 * self.total_wait / self.granted, 3) if self.granted else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait_seen, 3),
+        }
+
+
+_throttles: Dict[str, AsyncThrottle] = {}
+
+
+def get_throttle(name: str) -> AsyncThrottle:
+    """
+    Return the process-wide throttle for upstream `name` (see UPSTREAM_THROTTLES).
+    """
+    throttle = _throttles.get(name)
+    if throttle is None:
+        if name not in UPSTREAM_THROTTLES:
+            raise ValueError(f"Unknown upstream throttle: {name}")
+        throttle = AsyncThrottle(name, **UPSTREAM_THROTTLES[name])
+        _throttles[name] = throttle
+    return throttle
+
+
+def throttle_stats() -> dict:
+    return {name: throttle.stats() for name, throttle in _throttles.items()}
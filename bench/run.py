@@ -0,0 +1,291 @@
+# bench/run.py
+"""
+Load test /chat against local upstream stubs.
+
+    python -m bench.run --rps 50 --duration 30
+    python -m bench.run --rps 20 --duration 10 --llm-latency 1500 --photon-errors 0.05
+    python -m bench.run --rps 50 --duration 30 --json bench.json --max-p95 250
+
+By default the API runs in this process (no uvicorn needed) with its
+upstream URLs pointed at bench.stubs. With --url, an already running
+server is driven instead; start it against `python -m bench.stubs`.
+
+Requests are sent open-loop at the target rate and latency is measured
+from each request's scheduled send time, so a slow server cannot hide
+its queueing delay by slowing the load generator down.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+from bench.stubs import UpstreamStubs, add_profile_arguments, profiles_from_args
+
+
+# Zipf-like popularity: earlier entries are requested more often
+LANDMARKS = [
+    "Monas",
+    "Sudirman",
+    "Blok M",
+    "Grand Indonesia",
+    "Kota Tua",
+    "Senayan",
+    "Kemang",
+    "Ancol",
+    "Tanah Abang",
+    "Kuningan",
+    "Menteng",
+    "Cikini",
+    "Pluit",
+    "Kelapa Gading",
+    "Cawang",
+    "Pondok Indah",
+]
+
+QUERIES = ["coffee", "ramen", "sate", "nasi goreng", "pharmacy", "atm", "gym", "bakery", "hospital", "bookstore"]
+
+DIRECTIONS_TEMPLATES = [
+    "How do I get from {a} to {b}?",
+    "directions from {a} to {b}",
+    "I want to go to {b} from {a}",
+]
+PLACES_TEMPLATES = [
+    "{q} near {loc}",
+    "Where can I eat {q} near {loc}?",
+    "find {q} around {loc}",
+]
+# Phrasings the rule-based fast path does not handle, so they reach the LLM
+LLM_TEMPLATES = [
+    "I'm craving {q}, anything good around {loc}?",
+    "I want {q} tonight, what's worth trying by {loc}?",
+]
+
+DEFAULT_MIX = "directions=5,places=4,llm=1"
+
+
+def _zipf_choice(rng: random.Random, items: List[str], s: float = 1.1) -> str:
+    weights = [1 / (i + 1) ** s for i in range(len(items))]
+    return rng.choices(items, weights=weights)[0]
+
+
+def generate_messages(count: int, mix: Dict[str, float], seed: int) -> List[str]:
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    messages = []
+
+    for _ in range(count):
+        kind = rng.choices(kinds, weights=weights)[0]
+        if kind == "directions":
+            a = _zipf_choice(rng, LANDMARKS)
+            b = _zipf_choice(rng, [x for x in LANDMARKS if x != a])
+            messages.append(rng.choice(DIRECTIONS_TEMPLATES).format(a=a, b=b))
+        else:
+            q = _zipf_choice(rng, QUERIES)
+            loc = _zipf_choice(rng, LANDMARKS)
+            templates = PLACES_TEMPLATES if kind == "places" else LLM_TEMPLATES
+            messages.append(rng.choice(templates).format(q=q, loc=loc))
+
+    return messages
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ("directions", "places", "llm"):
+            raise ValueError(f"Unknown message kind in --mix: {kind}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile, q in [0, 100].
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def drive(client: httpx.AsyncClient, api_key: str, messages: List[str], rps: float) -> dict:
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def send(message: str, scheduled: float):
+        try:
+            resp = await client.post("/chat", json={"message": message}, headers={"X-API-Key": api_key})
+            status = resp.status_code
+        except httpx.HTTPError:
+            status = "transport_error"
+        statuses[status] += 1
+        latencies.append(loop.time() - scheduled)
+
+    started = loop.time()
+    tasks = []
+    for i, message in enumerate(messages):
+        scheduled = started + i / rps
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(message, scheduled)))
+
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - started
+
+    ok = statuses.get(200, 0)
+    return {
+        "requests": len(messages),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "status": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+        "latency_ms": {
+            "p50": round(1000 * percentile(latencies, 50), 2),
+            "p95": round(1000 * percentile(latencies, 95), 2),
+            "p99": round(1000 * percentile(latencies, 99), 2),
+            "max": round(1000 * max(latencies, default=0.0), 2),
+        },
+    }
+
+
+def _hit_rate(before: dict, after: dict) -> Optional[float]:
+    hits = after.get("hits", 0) - before.get("hits", 0)
+    misses = after.get("misses", 0) - before.get("misses", 0)
+    return round(hits / (hits + misses), 3) if hits + misses else None
+
+
+def cache_report(before: dict, after: dict) -> dict:
+    report = {}
+    for name in ("response_cache", "places_proximity_cache", "hot_routes", "intent_cache", "geocode_cache"):
+        if after.get(name):
+            report[name] = _hit_rate(before.get(name, {}), after[name])
+
+    intent_before, intent_after = before.get("intent", {}), after.get("intent", {})
+    report["llm_calls"] = intent_after.get("llm_calls", 0) - intent_before.get("llm_calls", 0)
+    return report
+
+
+def _configure_backend(stubs: UpstreamStubs, data_dir: str):
+    # Must run before any backend module is imported: they read config at import time
+    from backend import config
+
+    config.LLM_ENDPOINT = f"{stubs.base_url}/api/generate"
+    config.PHOTON_BASE_URL = f"{stubs.base_url}/api"
+    config.OSRM_BASE_URL = stubs.base_url
+    config.UPSTREAM_THROTTLES = config.MAP_DEPLOYMENTS["local"]["throttles"]
+    config.LLM_WARMUP = False
+    config.LOCAL_POI_INDEX_PATH = None
+    config.SHARED_STATE_URL = "memory://"
+    config.GEOCODE_CACHE_PATH = os.path.join(data_dir, "geocode_cache.sqlite3")
+    config.HOT_ROUTES_PATH = os.path.join(data_dir, "hot_routes.sqlite3")
+
+
+async def run(args) -> dict:
+    messages = generate_messages(int(args.rps * args.duration), parse_mix(args.mix), args.seed)
+
+    if args.url:
+        # The server under test talks to its own stubs (python -m bench.stubs)
+        if not args.api_key:
+            raise SystemExit("--api-key is required with --url")
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            return await _measure(client, args.api_key, messages, args)
+
+    stubs = UpstreamStubs(profiles_from_args(args), seed=args.seed)
+    await stubs.start()
+
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            _configure_backend(stubs, data_dir)
+
+            from backend.main import app
+            from backend.security.api_keys import register_api_key
+
+            api_key = register_api_key("bench@example.com", rate_limit=10**9)
+            transport = httpx.ASGITransport(app=app)
+
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+                    result = await _measure(client, api_key, messages, args)
+    finally:
+        await stubs.close()
+
+    result["upstream_requests"] = dict(stubs.requests)
+    return result
+
+
+async def _measure(client: httpx.AsyncClient, api_key: str, messages: List[str], args) -> dict:
+    before = (await client.get("/stats")).json()
+    result = await drive(client, api_key, messages, args.rps)
+    after = (await client.get("/stats")).json()
+
+    result["target_rps"] = args.rps
+    result["mix"] = args.mix
+    result["seed"] = args.seed
+    result["cache_hit_rate"] = cache_report(before, after)
+    return result
+
+
+def _print_report(result: dict):
+    latency = result["latency_ms"]
+    print(f"requests      {result['requests']} in {result['elapsed_s']}s (target {result['target_rps']} rps)")
+    print(f"throughput    {result['throughput_rps']} ok/s")
+    print(f"status        {result['status']}")
+    print(f"latency ms    p50={latency['p50']}  p95={latency['p95']}  p99={latency['p99']}  max={latency['max']}")
+    print(f"cache hits    {result['cache_hit_rate']}")
+    if "upstream_requests" in result:
+        print(f"upstream      {result['upstream_requests']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark /chat against local upstream stubs")
+    parser.add_argument("--rps", type=float, default=20.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"message kind weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request client timeout (s)")
+    parser.add_argument("--url", help="benchmark a running server instead of an in-process app")
+    parser.add_argument("--api-key", help="API key for --url")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    parser.add_argument("--max-p95", type=float, help="exit non-zero if p95 latency (ms) exceeds this")
+    parser.add_argument("--min-success", type=float, default=0.0, help="exit non-zero if the 200 ratio is lower")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    result = asyncio.run(run(args))
+    result["wall_s"] = round(time.time() - started, 3)
+
+    _print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    failed = False
+    if args.max_p95 is not None and result["latency_ms"]["p95"] > args.max_p95:
+        print(f"FAIL: p95 {result['latency_ms']['p95']}ms > {args.max_p95}ms")
+        failed = True
+
+    success = result["status"].get("200", 0) / result["requests"] if result["requests"] else 1.0
+    if success < args.min_success:
+        print(f"FAIL: success ratio {success:.3f} < {args.min_success}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
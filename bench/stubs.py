@@ -0,0 +1,328 @@
+# bench/stubs.py
+"""
+Local stand-ins for Ollama, Photon and OSRM.
+
+One dependency-free asyncio HTTP/1.1 server answers all three APIs on a
+single port, with a configurable latency/error profile per upstream:
+
+    POST /api/generate              Ollama (streaming and non-streaming)
+    GET  /api?q=...                 Photon search
+    GET  /route/v1/{profile}/...    OSRM route
+    GET  /table/v1/{profile}/...    OSRM table
+
+Responses are deterministic for a given request so cache behaviour is
+reproducible. Run standalone to benchmark a separately started server:
+
+    python -m bench.stubs --port 8900 --llm-latency 800
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Response time ~ Normal(latency_ms, jitter_ms), clipped at 0;
+    `error_rate` of requests fail with 503 after the same delay.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+    def sample(self, rng: random.Random) -> Tuple[float, bool]:
+        delay = max(0.0, rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        return delay, rng.random() < self.error_rate
+
+
+# Messages the stub "LLM" understands; anything else becomes a generic search
+_LLM_DIRECTIONS = re.compile(r"from (?P<origin>.+?) to (?P<destination>[^?.!]+)", re.IGNORECASE)
+_LLM_PLACES = re.compile(
+    r"(?:craving|want|looking for)\s+(?P<query>[^,?]+).*?(?:around|close to|by)\s+(?P<location>[^?.!]+)",
+    re.IGNORECASE,
+)
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+def stub_intent(prompt: str) -> dict:
+    match = _LLM_DIRECTIONS.search(prompt)
+    if match:
+        return {
+            "intent": "get_directions",
+            "origin": match.group("origin").strip(),
+            "destination": match.group("destination").strip(),
+        }
+
+    match = _LLM_PLACES.search(prompt)
+    if match:
+        return {
+            "intent": "find_places",
+            "query": match.group("query").strip(),
+            "location": match.group("location").strip(),
+            "limit": 5,
+        }
+
+    return {"intent": "find_places", "query": prompt.strip()[:40], "location": "Jakarta", "limit": 5}
+
+
+def _unit(text: str, salt: str) -> float:
+    # Stable pseudo-random number in [0, 1) derived from the request
+    digest = hashlib.blake2b(f"{salt}:{text}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+def photon_features(q: str, limit: int) -> List[dict]:
+    features = []
+    for i in range(limit):
+        # Spread results over central Jakarta
+        lat = -6.30 + 0.2 * _unit(q, f"lat{i}")
+        lon = 106.70 + 0.25 * _unit(q, f"lon{i}")
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {
+                    "name": f"{q.title()} #{i + 1}",
+                    "street": f"Jalan Stub {i + 1}",
+                    "city": "Jakarta",
+                    "country": "Indonesia",
+                    "osm_value": "restaurant",
+                },
+            }
+        )
+    return features
+
+
+def osrm_route(points: List[Tuple[float, float]], vertices: int = 200) -> dict:
+    # Straight segments between waypoints, densified to a realistic vertex count
+    coordinates = []
+    per_leg = max(2, vertices // max(1, len(points) - 1))
+    legs = []
+    for (lon1, lat1), (lon2, lat2) in zip(points, points[1:]):
+        for k in range(per_leg):
+            t = k / per_leg
+            coordinates.append([lon1 + (lon2 - lon1) * t, lat1 + (lat2 - lat1) * t])
+        distance = 111_000 * ((lon2 - lon1) ** 2 + (lat2 - lat1) ** 2) ** 0.5
+        legs.append({"distance": distance, "duration": distance / 8.0})
+    coordinates.append(list(points[-1]))
+
+    return {
+        "code": "Ok",
+        "routes": [
+            {
+                "distance": sum(leg["distance"] for leg in legs),
+                "duration": sum(leg["duration"] for leg in legs),
+                "geometry": {"type": "LineString", "coordinates": coordinates},
+                "legs": legs,
+            }
+        ],
+    }
+
+
+def osrm_table(points: List[Tuple[float, float]], sources: List[int], destinations: List[int]) -> dict:
+    distances = []
+    for s in sources:
+        row = []
+        for d in destinations:
+            (lon1, lat1), (lon2, lat2) = points[s], points[d]
+            row.append(111_000 * ((lon2 - lon1) ** 2 + (lat2 - lat1) ** 2) ** 0.5)
+        distances.append(row)
+    return {
+        "code": "Ok",
+        "durations": [[d / 8.0 for d in row] for row in distances],
+        "distances": distances,
+    }
+
+
+class UpstreamStubs:
+    def __init__(self, profiles: Optional[Dict[str, LatencyProfile]] = None, seed: int = 0):
+        self.profiles = {"llm": LatencyProfile(), "photon": LatencyProfile(), "osrm": LatencyProfile()}
+        self.profiles.update(profiles or {})
+        self.requests = {"llm": 0, "photon": 0, "osrm": 0}
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                await self._dispatch(method, target, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status: int, payload):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+    async def _dispatch(self, method: str, target: str, body: bytes, writer):
+        url = urlsplit(target)
+        path = url.path
+
+        if method == "POST" and path == "/api/generate":
+            upstream = "llm"
+        elif method == "GET" and path == "/api":
+            upstream = "photon"
+        elif method == "GET" and (path.startswith("/route/v1/") or path.startswith("/table/v1/")):
+            upstream = "osrm"
+        else:
+            await self._respond(writer, 404, {"error": "not found"})
+            return
+
+        self.requests[upstream] += 1
+        delay, fail = self.profiles[upstream].sample(self._rng)
+
+        if upstream == "llm":
+            payload = json.loads(body or b"{}")
+            if fail:
+                await asyncio.sleep(delay)
+                await self._respond(writer, 503, {"error": "stub failure"})
+            elif payload.get("stream"):
+                await self._stream_generate(writer, payload, delay)
+            else:
+                await asyncio.sleep(delay)
+                await self._respond(
+                    writer, 200, {"response": json.dumps(stub_intent(payload.get("prompt", ""))), "done": True}
+                )
+            return
+
+        await asyncio.sleep(delay)
+        if fail:
+            await self._respond(writer, 503, {"error": "stub failure"})
+            return
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if upstream == "photon":
+            limit = int(params.get("limit", 5))
+            await self._respond(writer, 200, {"features": photon_features(params.get("q", ""), limit)})
+            return
+
+        service, _, _, coordinates = path.strip("/").split("/", 3)
+        points = [tuple(float(v) for v in pair.split(",")) for pair in coordinates.split(";")]
+
+        if service == "route":
+            await self._respond(writer, 200, osrm_route(points))
+        else:
+            sources = [int(i) for i in params["sources"].split(";")]
+            destinations = [int(i) for i in params["destinations"].split(";")]
+            await self._respond(writer, 200, osrm_table(points, sources, destinations))
+
+    async def _stream_generate(self, writer, payload: dict, delay: float):
+        """
+        Ollama-style NDJSON token stream over chunked transfer encoding;
+        `delay` is spread over the chunks like decode time.
+        """
+        text = json.dumps(stub_intent(payload.get("prompt", "")))
+        pieces = [text[i : i + 8] for i in range(0, len(text), 8)]
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+
+        def chunk(obj):
+            data = (json.dumps(obj) + "\n").encode()
+            return f"{len(data):x}\r\n".encode() + data + b"\r\n"
+
+        for piece in pieces:
+            await asyncio.sleep(delay / len(pieces))
+            writer.write(chunk({"response": piece, "done": False}))
+            await writer.drain()
+
+        writer.write(chunk({"response": "", "done": True}) + b"0\r\n\r\n")
+        await writer.drain()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    for name, latency in (("llm", 600.0), ("photon", 40.0), ("osrm", 30.0)):
+        parser.add_argument(f"--{name}-latency", type=float, default=latency, help=f"{name} mean latency (ms)")
+        parser.add_argument(f"--{name}-jitter", type=float, default=latency / 4, help=f"{name} latency stddev (ms)")
+        parser.add_argument(f"--{name}-errors", type=float, default=0.0, help=f"{name} error rate (0-1)")
+
+
+def profiles_from_args(args) -> Dict[str, LatencyProfile]:
+    return {
+        name: LatencyProfile(
+            latency_ms=getattr(args, f"{name}_latency"),
+            jitter_ms=getattr(args, f"{name}_jitter"),
+            error_rate=getattr(args, f"{name}_errors"),
+        )
+        for name in ("llm", "photon", "osrm")
+    }
+
+
+async def _serve(args):
+    stubs = UpstreamStubs(profiles_from_args(args), seed=args.seed)
+    await stubs.start(args.host, args.port)
+    print(f"Upstream stubs listening on {stubs.base_url}")
+    print(f'  LLM_ENDPOINT = "{stubs.base_url}/api/generate"')
+    print(f'  PHOTON_BASE_URL = "{stubs.base_url}/api"')
+    print(f'  OSRM_BASE_URL = "{stubs.base_url}"')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stubs.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local Ollama/Photon/OSRM stubs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=0)
+    add_profile_arguments(parser)
+
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import asyncio
+import gzip
+import itertools
+import json
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.config import RESPONSE_GZIP_LEVEL
+from backend.security.auth import get_current_user
+from backend.utils.errors import UpstreamError
+from backend.utils.serialization import EncodedResponse
+
+
+_owners = itertools.count()
+
+
+@pytest.fixture
+def client():
+    # No lifespan: nothing here needs the pools, warm-up or background jobs
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def _authenticate(rate_limit: int):
+    # A fresh owner per test keeps the shared rate limiter independent
+    user = {"owner": f"test-{next(_owners)}", "rate_limit": rate_limit, "active": True}
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+
+def _ndjson(response):
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_processes_repeated_messages_once(client, monkeypatch):
+    _authenticate(rate_limit=10)
+    calls = []
+
+    async def handle_chat(message, geometry="full", simplify_tolerance=None):
+        calls.append(message)
+        return EncodedResponse(json.dumps({"echo": message}).encode())
+
+    monkeypatch.setattr(main, "handle_chat", handle_chat)
+
+    response = client.post("/chat/batch", json={"messages": ["ramen near Monas", " ramen near Monas ", "sushi near Kemang"]})
+
+    assert response.status_code == 200
+    lines = sorted(_ndjson(response), key=lambda line: line["index"])
+    assert sorted(calls) == ["ramen near Monas", "sushi near Kemang"]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["result"] == lines[1]["result"] == {"echo": "ramen near Monas"}
+    assert lines[2] == {"index": 2, "status": 200, "result": {"echo": "sushi near Kemang"}}
+
+
+def test_batch_reports_rate_limited_and_failed_messages_per_line(client, monkeypatch):
+    _authenticate(rate_limit=2)
+
+    async def handle_chat(message, geometry="full", simplify_tolerance=None):
+        if message == "b":
+            raise UpstreamError("OSRM request timed out")
+        return EncodedResponse(b'{"ok":true}')
+
+    monkeypatch.setattr(main, "handle_chat", handle_chat)
+
+    response = client.post("/chat/batch", json={"messages": ["a", "b", "c"]})
+
+    assert response.status_code == 200
+    by_index = {line["index"]: line for line in _ndjson(response)}
+    assert by_index[0] == {"index": 0, "status": 200, "result": {"ok": True}}
+    assert by_index[1] == {"index": 1, "status": 502, "error": "OSRM request timed out"}
+    # Over the user's limit: only this message is refused
+    assert by_index[2] == {"index": 2, "status": 429, "error": "Too many requests"}
+
+
+def test_batch_streams_lines_in_completion_order(client, monkeypatch):
+    _authenticate(rate_limit=10)
+    delays = {"slow": 0.2, "fast": 0.0}
+
+    async def handle_chat(message, geometry="full", simplify_tolerance=None):
+        await asyncio.sleep(delays[message])
+        return EncodedResponse(json.dumps({"message": message}).encode())
+
+    monkeypatch.setattr(main, "handle_chat", handle_chat)
+
+    response = client.post("/chat/batch", json={"messages": ["slow", "fast"]})
+
+    lines = _ndjson(response)
+    assert [line["index"] for line in lines] == [1, 0]
+    assert [line["result"]["message"] for line in lines] == ["fast", "slow"]
+
+
+def test_batch_is_refused_when_no_message_is_admitted(client, monkeypatch):
+    _authenticate(rate_limit=1)
+
+    async def handle_chat(message, geometry="full", simplify_tolerance=None):
+        return EncodedResponse(b"{}")
+
+    monkeypatch.setattr(main, "handle_chat", handle_chat)
+
+    assert client.post("/chat/batch", json={"messages": ["a"]}).status_code == 200
+    assert client.post("/chat/batch", json={"messages": ["b"]}).status_code == 429
+
+
+class FakeProvider:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.geocoded = []
+        self.routed = 0
+
+    async def geocode_many(self, queries):
+        self.geocoded.extend(queries)
+        if self.fail:
+            raise UpstreamError("Photon request timed out")
+        return [(-6.17, 106.82), (-6.21, 106.82)]
+
+    async def get_directions(self, origin, destination, overview="full"):
+        self.routed += 1
+        return {
+            "distance": 4500.0,
+            "duration": 600.0,
+            "geometry": {"type": "LineString", "coordinates": [[106.82, -6.17], [106.82, -6.21]]},
+            "legs": [],
+        }
+
+
+@pytest.fixture
+def directions(monkeypatch, tmp_path):
+    """
+    chat_service with a fixed directions intent, a fake map provider and
+    empty response cache / hot route table.
+    """
+    from backend.schemas import LLMIntent
+    from backend.services import chat_service
+    from backend.services.hot_routes import HotRouteStore, HotRouteTable
+    from backend.utils.cache import TTLCache
+
+    async def extract_intent(message):
+        return LLMIntent(intent="get_directions", origin="Monas", destination="Sudirman")
+
+    provider = FakeProvider()
+    table = HotRouteTable(provider, HotRouteStore(str(tmp_path / "hot_routes.sqlite3")), top_k=1, min_requests=1)
+
+    monkeypatch.setattr(chat_service, "extract_intent", extract_intent)
+    monkeypatch.setattr(chat_service, "provider", provider)
+    monkeypatch.setattr(chat_service, "cache", TTLCache(ttl_seconds=60, max_entries=10))
+    monkeypatch.setattr(chat_service, "hot_routes", table)
+    return chat_service
+
+
+def _sse_events(response):
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_emits_intent_endpoints_route_then_done(client, directions):
+    _authenticate(rate_limit=10)
+
+    events = _sse_events(client.post("/chat/stream", json={"message": "Monas to Sudirman"}))
+
+    assert [event for event, _ in events] == ["intent", "endpoints", "route", "done"]
+    assert events[0][1]["origin"] == "Monas"
+    assert events[1][1]["origin"] == {"name": "Monas", "lat": -6.17, "lon": 106.82}
+    assert events[2][1]["route"]["distance_meters"] == 4500.0
+    # One lookup per request, not a get() followed by get_or_compute()
+    assert directions.cache.stats()["misses"] == 1
+
+    # Cached now: no geocoding, so no endpoints event
+    events = _sse_events(client.post("/chat/stream", json={"message": "Monas to Sudirman"}))
+    assert [event for event, _ in events] == ["intent", "route", "done"]
+    assert directions.provider.routed == 1
+
+
+def test_stream_reports_failures_as_an_error_event(client, directions):
+    _authenticate(rate_limit=10)
+    directions.provider.fail = True
+
+    events = _sse_events(client.post("/chat/stream", json={"message": "Monas to Sudirman"}))
+
+    assert [event for event, _ in events] == ["intent", "error"]
+    assert events[1][1] == {"status": 502, "detail": "Photon request timed out"}
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    """
+    handle_chat stubbed with a body large enough to get a gzip variant;
+    records the arguments of every call.
+    """
+    calls = []
+    body = json.dumps({"intent": "find_places", "places": [{"name": f"Ramen {i}"} for i in range(100)]}).encode()
+
+    async def handle_chat(message, geometry="full", simplify_tolerance=None):
+        calls.append((message, geometry, simplify_tolerance))
+        return EncodedResponse(body)
+
+    monkeypatch.setattr(main, "handle_chat", handle_chat)
+    return calls, body
+
+
+def test_get_chat_reads_the_request_from_the_query(client, chat):
+    _authenticate(rate_limit=10)
+    calls, body = chat
+
+    response = client.get(
+        "/chat",
+        params={"message": "ramen near Monas", "geometry": "polyline6", "simplify_tolerance": 5},
+        headers={"Accept-Encoding": "identity"},
+    )
+
+    assert response.status_code == 200
+    assert calls == [("ramen near Monas", "polyline6", 5.0)]
+    assert response.content == body
+    assert "content-encoding" not in response.headers
+
+    # Same validation as the POST body
+    assert client.get("/chat", params={"message": "x", "geometry": "svg"}).status_code == 422
+
+
+def test_chat_answers_304_for_a_matching_etag(client, chat):
+    _authenticate(rate_limit=10)
+
+    first = client.post("/chat", json={"message": "ramen near Monas"})
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["vary"] == "Accept-Encoding"
+
+    for tag in (etag, etag.removeprefix("W/"), f'"other", {etag}'):
+        response = client.get("/chat", params={"message": "ramen near Monas"}, headers={"If-None-Match": tag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    response = client.get("/chat", params={"message": "ramen near Monas"}, headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_chat_negotiates_content_encoding(client, chat):
+    _authenticate(rate_limit=10)
+    _, body = chat
+
+    compressed = client.post("/chat", json={"message": "ramen near Monas"}, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    # httpx decodes the body transparently
+    assert compressed.content == body
+    assert int(compressed.headers["content-length"]) == len(gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0))
+
+    for accept in ("identity", "gzip;q=0", "deflate"):
+        plain = client.post("/chat", json={"message": "ramen near Monas"}, headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in plain.headers, accept
+        assert plain.content == body
+        # Same representation, same validator
+        assert plain.headers["etag"] == compressed.headers["etag"]
+
+
+def test_importing_the_app_leaves_logging_alone():
+    code = "import logging, backend.main; print(len(logging.getLogger().handlers))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "0"
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import httpx
+
+from backend.llm.fast_path import parse_intent
+from bench.run import LLM_TEMPLATES, generate_messages, parse_mix, percentile
+from bench.stubs import LatencyProfile, UpstreamStubs
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_message_mix_is_reproducible():
+    mix = parse_mix("directions=1,places=1,llm=1")
+
+    assert generate_messages(50, mix, seed=3) == generate_messages(50, mix, seed=3)
+
+
+def test_llm_templates_bypass_fast_path():
+    for template in LLM_TEMPLATES:
+        intent, _ = parse_intent(template.format(q="ramen", loc="Kemang"))
+        assert intent is None
+
+
+def test_stubs_answer_photon_osrm_and_ollama():
+    async def run():
+        stubs = UpstreamStubs({"photon": LatencyProfile(error_rate=0.0)})
+        await stubs.start()
+        try:
+            async with httpx.AsyncClient(base_url=stubs.base_url) as client:
+                photon = (await client.get("/api", params={"q": "ramen kemang", "limit": 3})).json()
+                route = (await client.get("/route/v1/driving/106.8,-6.2;106.82,-6.21?overview=full")).json()
+
+                async with client.stream(
+                    "POST", "/api/generate", json={"prompt": "from Monas to Kota Tua", "stream": True}
+                ) as resp:
+                    chunks = [json.loads(line) async for line in resp.aiter_lines() if line.strip()]
+        finally:
+            await stubs.close()
+        return photon, route, chunks, stubs.requests
+
+    photon, route, chunks, requests = asyncio.run(run())
+
+    assert len(photon["features"]) == 3
+    assert route["routes"][0]["distance"] > 0
+    intent = json.loads("".join(chunk["response"] for chunk in chunks))
+    assert intent == {"intent": "get_directions", "origin": "Monas", "destination": "Kota Tua"}
+    assert chunks[-1]["done"]
+    assert requests == {"llm": 1, "photon": 1, "osrm": 1}
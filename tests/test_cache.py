@@ -0,0 +1,195 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.utils.cache import TTLCache
+
+
+def test_cache_returns_value_within_ttl():
+    cache = TTLCache(ttl_seconds=5)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+
+def test_cache_expires_entries():
+    cache = TTLCache(ttl_seconds=0.1)
+    cache.set("a", 1)
+
+    time.sleep(0.2)
+
+    assert cache.get("a") is None
+
+
+def test_cache_sweep_removes_expired_entries():
+    cache = TTLCache(ttl_seconds=0.1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    time.sleep(0.2)
+
+    assert cache.sweep() == 2
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(ttl_seconds=5, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_respects_max_bytes():
+    cache = TTLCache(ttl_seconds=5, max_bytes=10)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+
+
+def test_cache_coalesces_concurrent_misses():
+    cache = TTLCache(ttl_seconds=5)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(50)))
+
+    results = asyncio.run(run())
+
+    assert results == ["value"] * 50
+    assert calls == 1
+
+
+def test_cache_does_not_store_failures():
+    cache = TTLCache(ttl_seconds=5)
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get_or_compute("k", fail))
+
+    assert cache.get("k") is None
+
+
+def test_cache_serves_stale_while_refreshing():
+    cache = TTLCache(ttl_seconds=0.2, stale_while_revalidate=5)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return calls
+
+    async def run():
+        first = await cache.get_or_compute("k", compute)
+        await asyncio.sleep(0.25)
+
+        # Expired: old value returned at once, refresh runs in the background
+        stale = await cache.get_or_compute("k", compute)
+        await asyncio.sleep(0.05)
+        refreshed = await cache.get_or_compute("k", compute)
+        return first, stale, refreshed
+
+    assert asyncio.run(run()) == (1, 1, 2)
+    assert calls == 2
+    assert cache.stale_hits == 1
+
+
+def test_cache_falls_back_to_stale_on_error():
+    cache = TTLCache(ttl_seconds=0.05, stale_if_error=5)
+
+    async def ok():
+        return "old"
+
+    async def fail():
+        raise ValueError("upstream down")
+
+    async def run():
+        await cache.get_or_compute("k", ok)
+        await asyncio.sleep(0.1)
+        return await cache.get_or_compute("k", fail)
+
+    assert asyncio.run(run()) == "old"
+    assert cache.stale_on_error == 1
+
+    # Without a stale entry the failure propagates
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get_or_compute("other", fail))
+
+
+def test_cache_stores_negative_results_briefly():
+    class NotFound(ValueError):
+        pass
+
+    cache = TTLCache(ttl_seconds=5, negative_ttl=0.1, negative_errors=(NotFound,))
+    calls = 0
+
+    async def missing():
+        nonlocal calls
+        calls += 1
+        raise NotFound("no route")
+
+    for _ in range(3):
+        with pytest.raises(NotFound):
+            asyncio.run(cache.get_or_compute("k", missing))
+    assert calls == 1
+    assert cache.get("k") is None
+
+    time.sleep(0.15)
+
+    with pytest.raises(NotFound):
+        asyncio.run(cache.get_or_compute("k", missing))
+    assert calls == 2
+
+
+def test_negative_hits_raise_a_fresh_error_each_time():
+    class NoRoute(ValueError):
+        def __init__(self, message, distance=None):
+            super().__init__(message)
+            self.distance = distance
+
+    cache = TTLCache(ttl_seconds=5, negative_ttl=60, negative_errors=(NoRoute,))
+
+    async def missing():
+        raise NoRoute("no route", distance=42)
+
+    async def lookup():
+        try:
+            await cache.get_or_compute("k", missing)
+        except NoRoute as e:
+            return e
+
+    async def run():
+        first = await lookup()
+        try:
+            raise KeyError("while handling something else")
+        except KeyError:
+            second = await lookup()
+        third, fourth = await asyncio.gather(lookup(), lookup())
+        return first, second, third, fourth
+
+    first, second, third, fourth = asyncio.run(run())
+
+    assert len({id(first), id(second), id(third), id(fourth)}) == 4
+    for error in (second, third, fourth):
+        assert error.args == ("no route",)
+        assert error.distance == 42
+    # One caller's context does not leak into another's error
+    assert isinstance(second.__context__, KeyError)
+    assert third.__context__ is None and fourth.__context__ is None
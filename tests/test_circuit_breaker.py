@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, hedged
+from backend.utils.errors import NoResultError, UpstreamError
+
+
+def _breaker(**overrides):
+    options = {"window": 4, "min_calls": 4, "failure_rate": 0.5, "slow_call_seconds": 1.0, "open_seconds": 0.1}
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+async def _call(breaker, error=None, delay=0.0):
+    async with breaker.call():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return "ok"
+
+
+def test_breaker_opens_on_failures_and_fails_fast():
+    breaker = _breaker()
+
+    async def run():
+        for error in (UpstreamError("down"), None, UpstreamError("down"), None):
+            try:
+                await _call(breaker, error)
+            except UpstreamError:
+                pass
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as exc:
+            await _call(breaker)
+        assert 0 < exc.value.retry_after <= 0.1
+
+    asyncio.run(run())
+
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_ignores_no_result_errors_and_counts_slow_calls():
+    breaker = _breaker(slow_call_seconds=0.01)
+
+    async def run():
+        for _ in range(4):
+            with pytest.raises(NoResultError):
+                await _call(breaker, NoResultError("no route"))
+        assert breaker.state == CLOSED
+
+        for delay in (0.0, 0.0, 0.02, 0.02):
+            await _call(breaker, delay=delay)
+
+    asyncio.run(run())
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["slow_calls"] == 2
+
+
+def test_breaker_half_open_trial_closes_or_reopens():
+    breaker = _breaker(min_calls=1, window=1)
+
+    async def run():
+        with pytest.raises(UpstreamError):
+            await _call(breaker, UpstreamError("down"))
+        await asyncio.sleep(0.12)
+
+        # One trial at a time
+        trial = asyncio.ensure_future(_call(breaker, UpstreamError("still down"), delay=0.02))
+        await asyncio.sleep(0)
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await _call(breaker)
+        with pytest.raises(UpstreamError):
+            await trial
+        assert breaker.state == OPEN
+
+        await asyncio.sleep(0.12)
+        assert await _call(breaker) == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_hedged_uses_secondary_when_primary_is_slow():
+    calls = []
+
+    async def primary():
+        calls.append("primary")
+        await asyncio.sleep(1.0)
+        return "primary"
+
+    async def secondary():
+        calls.append("secondary")
+        return "secondary"
+
+    started = time.monotonic()
+    result = asyncio.run(hedged(primary, secondary, delay=0.02))
+
+    assert result == "secondary"
+    assert calls == ["primary", "secondary"]
+    assert time.monotonic() - started < 0.5
+
+
+def test_hedged_skips_secondary_when_primary_is_fast_or_definitive():
+    calls = []
+
+    async def fast():
+        return "primary"
+
+    async def no_route():
+        raise NoResultError("no route")
+
+    async def secondary():
+        calls.append("secondary")
+        return "secondary"
+
+    assert asyncio.run(hedged(fast, secondary, delay=0.5)) == "primary"
+    with pytest.raises(NoResultError):
+        asyncio.run(hedged(no_route, secondary, delay=0.5))
+    assert calls == []
+
+
+def test_hedged_falls_over_immediately_on_upstream_error():
+    async def failing():
+        raise CircuitOpenError("open")
+
+    async def secondary():
+        return "secondary"
+
+    async def also_failing():
+        raise UpstreamError("secondary down")
+
+    started = time.monotonic()
+    assert asyncio.run(hedged(failing, secondary, delay=1.0)) == "secondary"
+    assert time.monotonic() - started < 0.5
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(hedged(failing, also_failing, delay=1.0))
@@ -0,0 +1,73 @@
+from backend.llm.fast_path import parse_intent
+
+
+def test_fast_path_parses_from_to_directions():
+    intent, confidence = parse_intent("How do I get from Monas to Sudirman?")
+
+    assert intent.intent == "get_directions"
+    assert intent.origin == "Monas"
+    assert intent.destination == "Sudirman"
+    assert confidence >= 0.9
+
+
+def test_fast_path_parses_to_from_directions():
+    intent, _ = parse_intent("I want to go to Monumen Nasional Jakarta from Margo City Depok")
+
+    assert intent.intent == "get_directions"
+    assert intent.origin == "Margo City Depok"
+    assert intent.destination == "Monumen Nasional Jakarta"
+
+
+def test_fast_path_parses_place_search():
+    intent, confidence = parse_intent("Where can I eat ramen near Sudirman Jakarta?")
+
+    assert intent.intent == "find_places"
+    assert intent.query == "ramen"
+    assert intent.location == "Sudirman Jakarta"
+    assert confidence >= 0.9
+
+
+def test_fast_path_defers_to_llm_for_free_text():
+    intent, confidence = parse_intent("Is there anything fun to do this weekend?")
+
+    assert intent is None
+    assert confidence < 0.8
+
+
+def test_fast_path_rejects_places_relative_to_the_user():
+    for message in (
+        "ramen near me",
+        "How do I get to Monas from here?",
+        "pizza at home",
+        "coffee around my place",
+        "directions from Monas to there",
+    ):
+        intent, confidence = parse_intent(message)
+
+        assert intent is None, message
+        assert confidence < 0.8, message
+
+
+def test_fast_path_sends_in_and_at_to_the_llm():
+    intent, confidence = parse_intent("I live in Depok")
+    assert intent is None
+    assert confidence < 0.8
+
+    # Parsed, but below FAST_PATH_MIN_CONFIDENCE
+    intent, confidence = parse_intent("sushi in Kemang")
+    assert intent.location == "Kemang"
+    assert confidence < 0.8
+
+
+def test_fast_path_sends_questions_and_compound_requests_to_the_llm():
+    for message in (
+        "What is the weather near Bogor",
+        "Is there parking near Monas",
+        "Is it raining near Jakarta",
+        "ramen near Sudirman and sushi near Kemang",
+        "from the airport to the hotel near Monas",
+    ):
+        intent, confidence = parse_intent(message)
+
+        assert intent is None, message
+        assert confidence < 0.8, message
@@ -0,0 +1,65 @@
+import asyncio
+
+from backend.providers.geocode_cache import GeocodeCache, normalize_place_name
+
+
+def test_normalize_place_name():
+    assert normalize_place_name("  Monas,   Jakarta! ") == "monas jakarta"
+    assert normalize_place_name("MONAS jakarta") == "monas jakarta"
+
+
+def test_geocode_cache_hit_and_miss(tmp_path):
+    cache = GeocodeCache(path=str(tmp_path / "geocode.sqlite3"), ttl_seconds=60)
+
+    async def run():
+        assert await cache.get("Monas Jakarta") is None
+        await cache.set("Monas Jakarta", (-6.175, 106.827))
+        return await cache.get("monas, jakarta")
+
+    assert asyncio.run(run()) == (-6.175, 106.827)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_geocode_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+
+    cache = GeocodeCache(path=path, ttl_seconds=60)
+    asyncio.run(cache.set("Sudirman Jakarta", (-6.21, 106.82)))
+    cache.close()
+
+    reopened = GeocodeCache(path=path, ttl_seconds=60)
+    assert asyncio.run(reopened.get("Sudirman Jakarta")) == (-6.21, 106.82)
+
+
+def test_geocode_cache_expires(tmp_path):
+    cache = GeocodeCache(path=str(tmp_path / "geocode.sqlite3"), ttl_seconds=-1)
+
+    async def run():
+        await cache.set("Monas Jakarta", (-6.175, 106.827))
+        return await cache.get("Monas Jakarta")
+
+    assert asyncio.run(run()) is None
+
+
+def test_repeated_lookups_are_served_from_memory(tmp_path, monkeypatch):
+    path = str(tmp_path / "geocode.sqlite3")
+    asyncio.run(GeocodeCache(path=path, ttl_seconds=60).set("Monas Jakarta", (-6.175, 106.827)))
+
+    cache = GeocodeCache(path=path, ttl_seconds=60, memory_entries=1)
+    reads = []
+    read = cache._read
+    monkeypatch.setattr(cache, "_read", lambda key: reads.append(key) or read(key))
+
+    async def run():
+        for _ in range(3):
+            assert await cache.get("monas, jakarta") == (-6.175, 106.827)
+        # Evicts Monas from memory (one entry): the next lookup reads the file again
+        await cache.set("Sudirman Jakarta", (-6.21, 106.82))
+        assert await cache.get("Sudirman Jakarta") == (-6.21, 106.82)
+        assert await cache.get("Monas Jakarta") == (-6.175, 106.827)
+
+    asyncio.run(run())
+
+    assert reads == ["monas jakarta", "monas jakarta"]
+    assert cache.stats()["memory_hits"] == 3
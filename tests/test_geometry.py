@@ -0,0 +1,20 @@
+from backend.utils.geometry import encode_polyline, simplify_line
+
+
+def test_simplify_line_drops_collinear_points():
+    line = [[106.80 + i * 0.001, -6.2] for i in range(100)]
+
+    assert simplify_line(line, tolerance_meters=1.0) == [line[0], line[-1]]
+
+
+def test_simplify_line_keeps_corners():
+    line = [[106.80, -6.20], [106.81, -6.20], [106.81, -6.21]]
+
+    assert simplify_line(line, tolerance_meters=1.0) == line
+
+
+def test_encode_polyline_matches_reference():
+    # Reference example from the polyline algorithm documentation (precision 5)
+    line = [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+
+    assert encode_polyline(line, precision=5) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
@@ -0,0 +1,155 @@
+import asyncio
+
+from backend.services.hot_routes import HotRouteStore, HotRouteTable
+
+
+class FakeProvider:
+    def __init__(self):
+        self.routes = 0
+
+    async def geocode_many(self, queries):
+        return [(-6.17, 106.82), (-6.21, 106.82)]
+
+    async def get_directions(self, origin, destination, overview="full"):
+        self.routes += 1
+        return {
+            "distance": 4500.0,
+            "duration": 600.0,
+            "geometry": {"type": "LineString", "coordinates": [[106.82, -6.17], [106.82, -6.21]]},
+            "legs": [],
+        }
+
+
+def _table(tmp_path, provider, **kwargs):
+    store = HotRouteStore(str(tmp_path / "hot_routes.sqlite3"))
+    options = dict(top_k=1, min_requests=2, refresh_after=3600, max_age=7200, track_max=100)
+    options.update(kwargs)
+    return HotRouteTable(provider, store, **options)
+
+
+def test_top_pairs_are_precomputed_and_served(tmp_path):
+    provider = FakeProvider()
+    table = _table(tmp_path, provider)
+
+    for _ in range(3):
+        table.record("get_directions|monas|sudirman", "Monas", "Sudirman")
+    table.record("get_directions|ancol|kemang", "Ancol", "Kemang")
+
+    assert table.get("get_directions|monas|sudirman") is None
+    assert asyncio.run(table.refresh()) == 1
+
+    route = table.get("get_directions|monas|sudirman")
+    assert route["distance"] == 4500.0
+    assert route["geometry"]["type"] == "LineString"
+    # Only the top-1 pair is routed
+    assert table.get("get_directions|ancol|kemang") is None
+    assert provider.routes == 1
+
+    # Fresh entries are not recomputed on the next run
+    for _ in range(2):
+        table.record("get_directions|monas|sudirman", "Monas", "Sudirman")
+    assert asyncio.run(table.refresh()) == 0
+    assert provider.routes == 1
+
+
+def test_routes_persist_across_instances(tmp_path):
+    table = _table(tmp_path, FakeProvider())
+    for _ in range(2):
+        table.record("get_directions|monas|sudirman", "Monas", "Sudirman")
+    asyncio.run(table.refresh())
+    table._store.close()
+
+    restarted = _table(tmp_path, FakeProvider())
+    assert restarted.get("get_directions|monas|sudirman")["duration"] == 600.0
+
+
+def test_rarely_requested_pairs_are_not_routed_and_counts_decay(tmp_path):
+    provider = FakeProvider()
+    table = _table(tmp_path, provider, min_requests=3)
+
+    for _ in range(2):
+        table.record("get_directions|monas|sudirman", "Monas", "Sudirman")
+
+    assert table.top_pairs() == []
+    asyncio.run(table.refresh())
+    assert provider.routes == 0
+    assert table.stats()["tracked_pairs"] == 1
+
+    asyncio.run(table.refresh())
+    assert table.stats()["tracked_pairs"] == 0
+
+
+def _chat_service(monkeypatch, tmp_path):
+    from backend.schemas import LLMIntent
+    from backend.services import chat_service
+
+    async def extract_intent(message):
+        return LLMIntent(intent="get_directions", origin="Monas", destination="Sudirman")
+
+    provider = FakeProvider()
+    provider.geocodes = 0
+    original_geocode_many = provider.geocode_many
+
+    async def geocode_many(queries):
+        provider.geocodes += 1
+        return await original_geocode_many(queries)
+
+    provider.geocode_many = geocode_many
+
+    monkeypatch.setattr(chat_service, "extract_intent", extract_intent)
+    monkeypatch.setattr(chat_service, "provider", provider)
+    monkeypatch.setattr(chat_service, "hot_routes", _table(tmp_path, provider))
+    return chat_service, provider
+
+
+def _fresh_response_cache(monkeypatch, chat_service):
+    from backend.utils.cache import TTLCache
+
+    monkeypatch.setattr(chat_service, "cache", TTLCache(ttl_seconds=60, max_entries=10))
+
+
+def test_chat_serves_stored_routes_without_upstream_calls(monkeypatch, tmp_path):
+    chat_service, provider = _chat_service(monkeypatch, tmp_path)
+    key = "get_directions|monas|sudirman"
+
+    async def run():
+        # Every directions request is counted, cached or not
+        _fresh_response_cache(monkeypatch, chat_service)
+        await chat_service.handle_chat("Monas to Sudirman")
+        await chat_service.handle_chat("Monas to Sudirman")
+        assert chat_service.hot_routes.top_pairs() == [(key, "Monas", "Sudirman")]
+
+        await chat_service.hot_routes.refresh()
+        provider.geocodes = provider.routes = 0
+
+        _fresh_response_cache(monkeypatch, chat_service)
+        response = await chat_service.handle_chat("Monas to Sudirman", geometry="polyline6")
+        assert response.json()["route"]["geometry_format"] == "polyline6"
+
+        _fresh_response_cache(monkeypatch, chat_service)
+        events = [event async for event, _ in chat_service.stream_chat("Monas to Sudirman")]
+        assert events == ["intent", "route"]
+
+        assert (provider.geocodes, provider.routes) == (0, 0)
+
+        # OSRM's own overview is never precomputed
+        await chat_service.handle_chat("Monas to Sudirman", geometry="overview")
+        assert (provider.geocodes, provider.routes) == (1, 1)
+
+    asyncio.run(run())
+
+    assert chat_service.hot_routes.stats()["hits"] == 2
+
+
+def test_unknown_pairs_do_not_read_the_store(tmp_path):
+    provider = FakeProvider()
+    table = _table(tmp_path, provider)
+    table.get("warm-up")  # loads the stored key set once
+
+    def fail(key):
+        raise AssertionError("SQLite read for a key that is not stored")
+
+    table._store.get = fail
+
+    assert table.get("get_directions|a|b") is None
+    assert table.stats()["misses"] == 2
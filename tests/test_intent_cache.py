@@ -0,0 +1,83 @@
+import asyncio
+
+from backend.llm.intent_cache import IntentCache, normalize_message
+from backend.schemas import LLMIntent
+
+
+def test_normalize_message_ignores_phrasing_noise():
+    a = normalize_message("Where can I eat ramen near Sudirman?")
+    b = normalize_message("where to eat  RAMEN near sudirman")
+
+    assert a == b == "eat ramen near sudirman"
+
+
+def test_normalize_message_keeps_direction():
+    a = normalize_message("How do I get from Monas to Sudirman?")
+    b = normalize_message("How do I get from Sudirman to Monas?")
+
+    assert a != b
+
+
+def test_intent_cache_skips_repeat_inference():
+    cache = IntentCache(ttl_seconds=60, max_entries=10, similarity_threshold=None)
+    calls = 0
+
+    async def extract():
+        nonlocal calls
+        calls += 1
+        return LLMIntent(intent="find_places", query="ramen", location="Sudirman")
+
+    async def run():
+        first = await cache.get_or_compute("Where can I eat ramen near Sudirman?", extract)
+        first.intent = "get_directions"  # callers mutate intents in place
+        return await cache.get_or_compute("where to eat ramen near sudirman", extract)
+
+    second = asyncio.run(run())
+
+    assert calls == 1
+    assert second.intent == "find_places"
+
+
+def test_intent_cache_similarity_lookup():
+    cache = IntentCache(ttl_seconds=60, max_entries=10, similarity_threshold=0.8)
+    calls = 0
+
+    async def extract():
+        nonlocal calls
+        calls += 1
+        return LLMIntent(intent="find_places", query="ramen", location="Sudirman Jakarta")
+
+    async def run():
+        await cache.get_or_compute("ramen near sudirman jakarta", extract)
+        return await cache.get_or_compute("ramen near sudirmann jakarta", extract)
+
+    intent = asyncio.run(run())
+
+    assert calls == 1
+    assert intent.location == "Sudirman Jakarta"
+
+
+def test_intent_cache_similarity_does_not_match_reversed_route():
+    cache = IntentCache(ttl_seconds=60, max_entries=10, similarity_threshold=0.8)
+    calls = []
+
+    async def extract_forward():
+        calls.append("forward")
+        return LLMIntent(intent="get_directions", origin="Margo City Depok", destination="Monas Jakarta")
+
+    async def extract_reverse():
+        calls.append("reverse")
+        return LLMIntent(intent="get_directions", origin="Monas Jakarta", destination="Margo City Depok")
+
+    async def run():
+        await cache.get_or_compute("from margo city depok to monas jakarta", extract_forward)
+        reverse = await cache.get_or_compute("from monas jakarta to margo city depok", extract_reverse)
+        # Near-duplicate slots still match
+        typo = await cache.get_or_compute("from margo city depok to monas jakartaa", extract_reverse)
+        return reverse, typo
+
+    reverse, typo = asyncio.run(run())
+
+    assert calls == ["forward", "reverse"]
+    assert reverse.origin == "Monas Jakarta"
+    assert typo.origin == "Margo City Depok"
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from backend.llm.scheduler import LLMScheduler
+from backend.utils.errors import ServiceOverloadedError
+
+
+def test_scheduler_caps_in_flight_calls():
+    scheduler = LLMScheduler(max_in_flight=2, max_queue=10, max_wait=5)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, scheduler.stats()["in_flight"])
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(scheduler.run(call) for _ in range(6)))
+
+    assert asyncio.run(run()) == ["ok"] * 6
+    assert peak == 2
+
+
+def test_scheduler_sheds_when_queue_is_full():
+    scheduler = LLMScheduler(max_in_flight=1, max_queue=1, max_wait=5)
+
+    async def call():
+        await asyncio.sleep(0.05)
+
+    async def run():
+        return await asyncio.gather(
+            *(scheduler.run(call) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert isinstance(results[2], ServiceOverloadedError)
+    assert scheduler.stats()["shed"] == 1
+
+
+def test_scheduler_sheds_after_queue_deadline():
+    scheduler = LLMScheduler(max_in_flight=1, max_queue=10, max_wait=0.05)
+
+    async def call():
+        await asyncio.sleep(0.2)
+
+    async def run():
+        first = asyncio.ensure_future(scheduler.run(call))
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceOverloadedError):
+            await scheduler.run(call)
+        await first
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+import asyncio
+
+from backend.providers.local_poi import LocalPOIProvider, build_index
+
+
+def _poi(name, lon, lat, **props):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {"name": name, **props},
+    }
+
+
+FEATURES = [
+    _poi("Ramen 38", 106.8095, -6.2275, street="Jalan Jenderal Sudirman", city="Jakarta", cuisine="ramen"),
+    _poi("Tazawa", 106.8096, -6.2278, street="Jalan Jenderal Sudirman", city="Jakarta", cuisine="ramen"),
+    _poi("Kopi Kenangan", 106.8100, -6.2280, street="Jalan Jenderal Sudirman", city="Jakarta", amenity="cafe"),
+    _poi("Ramen Depok", 106.8300, -6.3700, street="Jalan Margonda", city="Depok", cuisine="ramen"),
+]
+
+
+def _provider(tmp_path):
+    build_index(FEATURES, str(tmp_path))
+    return LocalPOIProvider(str(tmp_path), radius_meters=3000)
+
+
+def test_local_poi_search_filters_by_category_and_area(tmp_path):
+    provider = _provider(tmp_path)
+
+    results = asyncio.run(provider.search_places("ramen", "Sudirman Jakarta", limit=5))
+
+    assert {r["properties"]["name"] for r in results} == {"Ramen 38", "Tazawa"}
+
+
+def test_local_poi_search_unknown_area_returns_nothing(tmp_path):
+    provider = _provider(tmp_path)
+
+    assert asyncio.run(provider.search_places("ramen", "Bandung", limit=5)) == []
@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+
+from backend.utils.metrics import Histogram, timed, stage_seconds
+from backend.utils.request_context import RequestIdFilter, new_request_id, request_id_var
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", labelnames=("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.5, stage="a")
+    histogram.observe(5.0, stage="a")
+
+    lines = histogram.render()
+
+    assert 'test_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="a"} 3' in lines
+    assert histogram.summary()["a"]["count"] == 3
+
+
+def test_timed_records_even_when_block_raises():
+    before = stage_seconds.summary().get("test_failure", {}).get("count", 0)
+
+    with pytest.raises(RuntimeError):
+        with timed("test_failure"):
+            raise RuntimeError("boom")
+
+    assert stage_seconds.summary()["test_failure"]["count"] == before + 1
+
+
+def test_request_id_reuses_valid_incoming_id_only():
+    assert new_request_id("abc-123") == "abc-123"
+    assert new_request_id("bad id\nInjected: 1") != "bad id\nInjected: 1"
+    assert len(new_request_id(None)) == 32
+
+
+def test_request_id_filter_tags_log_records():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+    token = request_id_var.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    assert record.request_id == "req-1"
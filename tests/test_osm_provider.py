@@ -0,0 +1,101 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from backend.config import CIRCUIT_BREAKER
+from backend.providers.osm import OSMProvider
+from backend.utils import circuit_breaker, throttle
+from backend.utils.circuit_breaker import CircuitBreaker
+from backend.utils.errors import NoResultError
+from backend.utils.http import http_clients
+from backend.utils.throttle import AsyncThrottle
+
+
+def _provider(monkeypatch, handler) -> OSMProvider:
+    """
+    OSMProvider whose OSRM requests are answered by `handler`, with its own
+    unthrottled budget and a fresh circuit breaker.
+    """
+    monkeypatch.setitem(http_clients._clients, "osrm", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setitem(
+        throttle._throttles, "osrm", AsyncThrottle("osrm", rate=1000, burst=1000, max_concurrency=10, max_wait=1)
+    )
+    monkeypatch.setitem(circuit_breaker._breakers, "osrm", CircuitBreaker("osrm", **CIRCUIT_BREAKER))
+    return OSMProvider()
+
+
+def test_get_route_builds_osrm_url_with_lon_lat_pairs(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "code": "Ok",
+                "routes": [
+                    {
+                        "distance": 1200.0,
+                        "duration": 300.0,
+                        "geometry": {"type": "LineString", "coordinates": [[106.8, -6.2], [106.9, -6.3]]},
+                        "legs": [{"distance": 1200.0, "duration": 300.0, "steps": []}],
+                    }
+                ],
+            },
+        )
+
+    provider = _provider(monkeypatch, handler)
+    route = asyncio.run(provider.get_route([(-6.2, 106.8), (-6.25, 106.85), (-6.3, 106.9)], overview="simplified"))
+
+    (request,) = requests
+    assert request.url.path == "/route/v1/driving/106.8,-6.2;106.85,-6.25;106.9,-6.3"
+    assert parse_qs(request.url.query.decode()) == {"overview": ["simplified"], "geometries": ["geojson"]}
+    assert route["distance"] == 1200.0
+    assert route["legs"] == [{"distance": 1200.0, "duration": 300.0}]
+
+
+def test_get_table_indexes_sources_then_destinations(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        # One row per source, one column per destination
+        return httpx.Response(
+            200,
+            json={
+                "code": "Ok",
+                "durations": [[60.0, None, 180.0], [90.0, 120.0, 30.0]],
+                "distances": [[500.0, None, 1500.0], [700.0, 1000.0, 250.0]],
+            },
+        )
+
+    provider = _provider(monkeypatch, handler)
+    sources = [(-6.1, 106.1), (-6.2, 106.2)]
+    destinations = [(-6.3, 106.3), (-6.4, 106.4), (-6.5, 106.5)]
+    matrix = asyncio.run(provider.get_table(sources, destinations))
+
+    (request,) = requests
+    assert request.url.path == "/table/v1/driving/106.1,-6.1;106.2,-6.2;106.3,-6.3;106.4,-6.4;106.5,-6.5"
+    assert parse_qs(request.url.query.decode()) == {
+        "sources": ["0;1"],
+        "destinations": ["2;3;4"],
+        "annotations": ["duration,distance"],
+    }
+    assert matrix["durations"][1] == [90.0, 120.0, 30.0]
+    assert matrix["durations"][0][1] is None
+    assert matrix["distances"][0][2] == 1500.0
+
+
+def test_unroutable_input_is_a_no_result(monkeypatch):
+    def handler(request: httpx.Request):
+        return httpx.Response(400, json={"code": "NoSegment"})
+
+    provider = _provider(monkeypatch, handler)
+
+    with pytest.raises(NoResultError):
+        asyncio.run(provider.get_route([(-6.2, 106.8), (-6.3, 106.9)]))
+
+    with pytest.raises(ValueError):
+        asyncio.run(provider.get_table([], [(-6.3, 106.9)]))
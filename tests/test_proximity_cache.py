@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+from backend.services.proximity_cache import ProximityCache
+from backend.services.search_service import PlaceRecord
+from backend.utils import geohash, throttle
+from backend.utils.errors import ServiceOverloadedError
+from backend.utils.throttle import AsyncThrottle
+
+
+def test_geohash_encode_and_neighbors():
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    cell = geohash.encode(-6.2088, 106.8456, 6)
+    cells = geohash.neighbors(cell)
+    assert cells[0] == cell
+    assert len(set(cells)) == 9
+
+    min_lat, min_lon, max_lat, max_lon = geohash.bounds(cell)
+    assert min_lat <= -6.2088 <= max_lat and min_lon <= 106.8456 <= max_lon
+
+
+def _records(lat, lon, count):
+    return [PlaceRecord(f"Ramen {i}", lat + i * 0.001, lon, "Jakarta") for i in range(count)]
+
+
+def test_nearby_location_is_served_from_cache_by_distance():
+    cache = ProximityCache(precision=6, radius_meters=1000, ttl_seconds=60, max_entries=100)
+
+    # Searched near Sudirman; then asked about a point ~500 m away
+    cache.set("Ramen", -6.2100, 106.8200, _records(-6.2100, 106.8200, 5))
+    results = cache.get("ramen", -6.2060, 106.8220, limit=3)
+
+    assert [r.name for r in results] == ["Ramen 4", "Ramen 3", "Ramen 2"]
+    assert cache.hits == 1
+
+
+def test_far_or_sparse_locations_miss():
+    cache = ProximityCache(precision=6, radius_meters=1000, ttl_seconds=60, max_entries=100)
+    cache.set("ramen", -6.2100, 106.8200, _records(-6.2100, 106.8200, 3))
+
+    assert cache.get("ramen", -6.3000, 106.9000, limit=3) is None
+    assert cache.get("ramen", -6.2100, 106.8200, limit=5) is None
+    assert cache.get("sushi", -6.2100, 106.8200, limit=1) is None
+    assert cache.misses == 3
+
+
+class _SearchOnlyProvider:
+    def __init__(self):
+        self.geocoded = []
+
+    async def search_places(self, query, location, limit):
+        return [
+            {"geometry": {"coordinates": [106.82, -6.2]}, "properties": {"name": "Ramen 1", "city": "Jakarta"}},
+        ]
+
+    async def geocode(self, query):
+        self.geocoded.append(query)
+        raise ServiceOverloadedError("photon is busy, try again later")
+
+
+def _place_search(monkeypatch, photon_throttle):
+    from backend.schemas import LLMIntent
+    from backend.services import chat_service
+
+    provider = _SearchOnlyProvider()
+    proximity = ProximityCache(precision=6, radius_meters=1000, ttl_seconds=60, max_entries=10)
+
+    class NoGeocodes:
+        async def get(self, query):
+            return None
+
+    monkeypatch.setattr(chat_service, "provider", provider)
+    monkeypatch.setattr(chat_service, "places_proximity_cache", proximity)
+    monkeypatch.setattr(chat_service, "geocode_cache", NoGeocodes())
+    monkeypatch.setitem(throttle._throttles, "photon", photon_throttle)
+
+    intent = LLMIntent(intent="find_places", query="ramen", location="Sudirman", limit=1)
+    body = asyncio.run(chat_service._search_places(intent))
+    return json.loads(body), provider, proximity
+
+
+def test_place_search_succeeds_when_the_extra_geocode_fails(monkeypatch):
+    idle = AsyncThrottle("photon", rate=100, burst=10, max_concurrency=10, max_wait=1)
+
+    response, provider, proximity = _place_search(monkeypatch, idle)
+
+    assert provider.geocoded == ["Sudirman"]
+    assert [place["name"] for place in response["places"]] == ["Ramen 1"]
+    assert len(proximity._cache) == 0
+
+
+def test_place_search_skips_the_extra_geocode_without_spare_capacity(monkeypatch):
+    # Same budget as the "public" profile
+    public = AsyncThrottle("photon", rate=1.0, burst=3, max_concurrency=2, max_wait=5.0)
+
+    response, provider, _ = _place_search(monkeypatch, public)
+
+    assert provider.geocoded == []
+    assert len(response["places"]) == 1
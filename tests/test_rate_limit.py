@@ -1,5 +1,7 @@
+import asyncio
 import time
-from backend.utils.rate_limit import SimpleRateLimiter
+from backend.utils.rate_limit import SharedRateLimiter, SimpleRateLimiter
+from backend.utils.shared_state import InMemoryBackend
 
 
 def test_rate_limiter_allows_within_limit():
@@ -31,3 +33,38 @@ def test_rate_limiter_resets_after_window():
     time.sleep(2.1)
 
     assert limiter.allow(key) is True
+
+
+def test_rate_limiter_honors_per_key_limit():
+    limiter = SimpleRateLimiter(max_requests=1, window_seconds=5)
+
+    assert limiter.allow("premium", max_requests=3) is True
+    assert limiter.allow("premium", max_requests=3) is True
+    assert limiter.allow("premium", max_requests=3) is True
+    assert limiter.allow("premium", max_requests=3) is False
+
+    assert limiter.allow("basic") is True
+    assert limiter.allow("basic") is False
+
+
+def test_rate_limiter_evicts_idle_keys():
+    limiter = SimpleRateLimiter(max_requests=2, window_seconds=1)
+
+    for i in range(100):
+        limiter.allow(f"client{i}")
+
+    assert len(limiter) == 100
+
+    time.sleep(1.1)
+
+    assert limiter.evict_idle() == 100
+    assert len(limiter) == 0
+
+
+def test_shared_rate_limiter_with_in_memory_backend():
+    limiter = SharedRateLimiter("chat", max_requests=2, window_seconds=5, backend=InMemoryBackend())
+
+    async def run():
+        return [await limiter.allow("client1") for _ in range(3)]
+
+    assert asyncio.run(run()) == [True, True, False]
@@ -0,0 +1,42 @@
+from backend.schemas import PlacesResponse
+from backend.services.search_service import (
+    normalize_photon_places,
+    parse_photon_features,
+    places_response_json,
+)
+
+
+FEATURES = [
+    {
+        "geometry": {"type": "Point", "coordinates": [106.8272, -6.1754]},
+        "properties": {"name": "Kopi Kenangan", "street": "Jalan Sabang", "city": "Jakarta", "country": "Indonesia"},
+    },
+    {
+        "geometry": {"type": "Point", "coordinates": [106.81, -6.2]},
+        "properties": {"street": "Jalan Sudirman", "city": "Jakarta"},
+    },
+    {"geometry": {"type": "Point", "coordinates": [106.8]}, "properties": {"name": "Broken"}},
+    {"geometry": {"type": "Point", "coordinates": ["x", "y"]}, "properties": {"name": "Not numeric"}},
+    {"geometry": {"type": "Point", "coordinates": [200.0, -6.2]}, "properties": {"name": "Out of range"}},
+    {"properties": {"name": "No geometry"}},
+]
+
+
+def test_parse_photon_features_skips_invalid_points():
+    records = parse_photon_features(FEATURES)
+
+    assert [r.name for r in records] == ["Kopi Kenangan", "Jalan Sudirman"]
+    assert records[0].address == "Jalan Sabang, Jakarta, Indonesia"
+    assert (records[1].lat, records[1].lon) == (-6.2, 106.81)
+
+
+def test_places_response_json_matches_pydantic_serialization():
+    body = places_response_json("Coffee places near Sabang", parse_photon_features(FEATURES))
+
+    expected = PlacesResponse(
+        intent="find_places",
+        summary="Coffee places near Sabang",
+        places=normalize_photon_places(FEATURES),
+    )
+
+    assert body == expected.model_dump_json().encode()
@@ -0,0 +1,42 @@
+import gzip
+import json
+
+from backend.utils.serialization import EncodedResponse, dumps
+
+
+def test_dumps_is_compact_utf8_json():
+    assert dumps({"name": "Café", "lat": -6.2}) == '{"name":"Café","lat":-6.2}'.encode()
+
+
+def test_small_bodies_are_not_compressed():
+    response = EncodedResponse(b'{"ok":true}')
+
+    assert response.variants == {}
+    assert response.negotiate("gzip, br") == (b'{"ok":true}', None)
+
+
+def test_large_bodies_are_served_compressed_when_accepted():
+    body = dumps({"coordinates": [[106.8 + i / 1e4, -6.2] for i in range(500)]})
+    response = EncodedResponse(body)
+
+    compressed, encoding = response.negotiate("gzip;q=0.8, identity")
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+    assert response.nbytes == len(body) + sum(len(v) for v in response.variants.values())
+
+    assert response.negotiate("gzip;q=0") == (body, None)
+    assert response.negotiate(None) == (body, None)
+
+
+def test_etag_matches_if_none_match():
+    response = EncodedResponse(b'{"a":1}')
+    other = EncodedResponse(b'{"a":2}')
+
+    assert response.etag.startswith('W/"')
+    assert response.etag != other.etag
+    assert response.not_modified(response.etag)
+    assert response.not_modified(f'"x", {response.etag[2:]}')
+    assert response.not_modified("*")
+    assert not response.not_modified(other.etag)
+    assert not response.not_modified(None)
+    assert response.json() == json.loads(b'{"a":1}')
@@ -0,0 +1,97 @@
+import asyncio
+import os
+
+import pytest
+
+from backend.utils.shared_state import RedisBackend
+
+
+_SERVER_URL = os.environ.get("DIRECTIO_TEST_REDIS_URL")
+
+
+@pytest.fixture(params=["fakeredis", "server"])
+def connect(request):
+    """
+    Returns an async factory of RedisBackends that share one server, like
+    several workers would: fakeredis (which runs the Lua script with lupa),
+    or the real server at DIRECTIO_TEST_REDIS_URL.
+    """
+    if request.param == "fakeredis":
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        server = fakeredis.FakeServer()
+
+        async def factory():
+            return RedisBackend("redis://fake", client=fakeredis.FakeAsyncRedis(server=server))
+
+    else:
+        if not _SERVER_URL:
+            pytest.skip("DIRECTIO_TEST_REDIS_URL is not set")
+        redis = pytest.importorskip("redis.asyncio")
+        flushed = False
+
+        async def factory():
+            nonlocal flushed
+            client = redis.from_url(_SERVER_URL)
+            if not flushed:
+                await client.flushdb()
+                flushed = True
+            return RedisBackend(_SERVER_URL, client=client)
+
+    return factory
+
+
+def test_token_bucket_denies_when_empty_and_refills(connect):
+    async def run():
+        backend = await connect()
+        try:
+            taken = [await backend.take_token("user", capacity=2, window_seconds=0.4) for _ in range(3)]
+            assert taken == [True, True, False]
+
+            # 2 tokens per 0.4 s: one is back after 0.2 s
+            await asyncio.sleep(0.25)
+            assert await backend.take_token("user", capacity=2, window_seconds=0.4)
+            assert not await backend.take_token("user", capacity=2, window_seconds=0.4)
+
+            # Buckets are per key
+            assert await backend.take_token("other", capacity=2, window_seconds=0.4)
+        finally:
+            await backend.close()
+
+    asyncio.run(run())
+
+
+def test_token_bucket_is_shared_and_atomic_across_workers(connect):
+    async def run():
+        workers = [await connect() for _ in range(3)]
+        try:
+            results = await asyncio.gather(
+                *(workers[i % 3].take_token("shared", capacity=5, window_seconds=60) for i in range(30))
+            )
+        finally:
+            for backend in workers:
+                await backend.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results.count(True) == 5
+
+
+def test_idle_buckets_and_values_expire(connect):
+    async def run():
+        backend = await connect()
+        try:
+            await backend.take_token("idle", capacity=3, window_seconds=0.2)
+            assert 0 < await backend._redis.pttl("directio:idle") <= 200
+
+            await backend.set("response:x", b"body", ttl_seconds=0.2)
+            assert await backend.get("response:x") == b"body"
+
+            await asyncio.sleep(0.3)
+            assert await backend.get("response:x") is None
+            assert await backend._redis.exists("directio:idle") == 0
+        finally:
+            await backend.close()
+
+    asyncio.run(run())
@@ -0,0 +1,21 @@
+from backend.llm.streaming import JSONObjectScanner
+
+
+def test_scanner_reports_object_when_closing_brace_arrives():
+    scanner = JSONObjectScanner()
+
+    assert scanner.feed('{"intent": "find_') == []
+    assert scanner.feed('places", "limit": 5') == []
+    assert scanner.feed("} and some trailing text") == ['{"intent": "find_places", "limit": 5}']
+
+
+def test_scanner_ignores_braces_inside_strings():
+    scanner = JSONObjectScanner()
+
+    assert scanner.feed('{"location": "Sudirman {\\"x\\"}"}') == ['{"location": "Sudirman {\\"x\\"}"}']
+
+
+def test_scanner_skips_leading_prose_and_nested_objects():
+    scanner = JSONObjectScanner()
+
+    assert scanner.feed('Sure! {"a": {"b": 1}}{"c": 2}') == ['{"a": {"b": 1}}', '{"c": 2}']
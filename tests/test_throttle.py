@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.utils.errors import ServiceOverloadedError
+from backend.utils.throttle import AsyncThrottle
+
+
+def test_throttle_allows_burst_then_paces_at_rate():
+    throttle = AsyncThrottle("test", rate=20, burst=2, max_concurrency=10, max_wait=5)
+
+    async def run():
+        started = time.monotonic()
+        for _ in range(4):
+            async with throttle.slot():
+                pass
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+
+    # 2 from the burst, then 2 more at 20/s
+    assert 0.08 <= elapsed < 0.5
+
+
+def test_throttle_caps_concurrency_and_serves_fifo():
+    throttle = AsyncThrottle("test", rate=1000, burst=1000, max_concurrency=1, max_wait=5)
+    order = []
+
+    async def call(i):
+        async with throttle.slot():
+            order.append(i)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call(i) for i in range(5)))
+
+    asyncio.run(run())
+
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_throttle_rejects_after_max_wait():
+    throttle = AsyncThrottle("test", rate=1000, burst=1000, max_concurrency=1, max_wait=0.05)
+
+    async def hold():
+        async with throttle.slot():
+            await asyncio.sleep(0.2)
+
+    async def run():
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceOverloadedError):
+            await throttle.acquire()
+        await holder
+
+    asyncio.run(run())
+    assert throttle.stats()["rejected"] == 1
+
+
+def test_throttle_reports_spare_capacity():
+    throttle = AsyncThrottle("test", rate=0.001, burst=2, max_concurrency=3, max_wait=5)
+
+    async def run():
+        assert throttle.has_capacity(2)
+        assert not throttle.has_capacity(3)  # only 2 tokens
+
+        await throttle.acquire()
+        assert throttle.has_capacity(1)
+        assert not throttle.has_capacity(2)
+
+    asyncio.run(run())
+
+
+def test_throttle_survives_a_new_event_loop():
+    # One token every 50 ms; each asyncio.run is a new loop, like separate test cases
+    throttle = AsyncThrottle("test", rate=20, burst=1, max_concurrency=10, max_wait=1)
+
+    async def leave_a_timer_behind():
+        await throttle.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(throttle.acquire(), timeout=0.01)
+
+    async def run():
+        started = time.monotonic()
+        await throttle.acquire()
+        await throttle.acquire()
+        return time.monotonic() - started
+
+    asyncio.run(leave_a_timer_behind())
+
+    assert asyncio.run(run()) < 0.5
+    assert throttle.stats()["rejected"] == 0
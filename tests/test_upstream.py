@@ -0,0 +1,142 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.config import CIRCUIT_BREAKER
+from backend.providers.upstream import Upstream
+from backend.utils import circuit_breaker, throttle
+from backend.utils.circuit_breaker import CircuitBreaker
+from backend.utils.errors import UpstreamError
+from backend.utils.http import http_clients
+from backend.utils.throttle import AsyncThrottle
+
+
+def _upstream(monkeypatch, handler, secondary_url=None, max_concurrency=10, **breaker) -> Upstream:
+    """
+    Photon Upstream answered by `handler`, with its own throttle and fresh breakers.
+    """
+    monkeypatch.setitem(http_clients._clients, "photon", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setitem(
+        throttle._throttles,
+        "photon",
+        AsyncThrottle("photon", rate=1000, burst=1000, max_concurrency=max_concurrency, max_wait=5),
+    )
+    options = {**CIRCUIT_BREAKER, **breaker}
+    for name in ("photon", "photon_secondary"):
+        monkeypatch.setitem(circuit_breaker._breakers, name, CircuitBreaker(name, **options))
+    return Upstream("photon", "Photon", "http://primary/api", secondary_url)
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_throttled_and_server_errors_are_upstream_errors(monkeypatch, status):
+    upstream = _upstream(monkeypatch, lambda request: httpx.Response(status))
+
+    with pytest.raises(UpstreamError, match=str(status)):
+        asyncio.run(upstream.get(params={"q": "ramen"}))
+
+    assert circuit_breaker._breakers["photon"].stats()["failures"] == 1
+
+
+def test_client_errors_are_returned_to_the_caller(monkeypatch):
+    upstream = _upstream(monkeypatch, lambda request: httpx.Response(400, json={"message": "bad"}))
+
+    resp = asyncio.run(upstream.get(params={"q": ""}))
+
+    assert resp.status_code == 400
+    # The upstream answered: not a failure
+    assert circuit_breaker._breakers["photon"].stats()["failures"] == 0
+
+
+def test_open_circuit_fails_fast_without_a_request(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    upstream = _upstream(monkeypatch, handler, min_calls=2, window=2)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(UpstreamError):
+                await upstream.get()
+        with pytest.raises(circuit_breaker.CircuitOpenError):
+            await upstream.get()
+
+    asyncio.run(run())
+
+    assert len(requests) == 2
+
+
+def test_queueing_in_the_throttle_is_not_upstream_latency(monkeypatch):
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={})
+
+    # One request at a time: the second waits ~50 ms for a slot
+    upstream = _upstream(monkeypatch, handler, max_concurrency=1, slow_call_seconds=0.08)
+
+    async def run():
+        await asyncio.gather(*(upstream.get() for _ in range(3)))
+
+    asyncio.run(run())
+
+    assert circuit_breaker._breakers["photon"].stats()["slow_calls"] == 0
+
+
+def test_slow_primary_is_hedged_to_the_secondary(monkeypatch):
+    hosts = []
+
+    async def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "primary":
+            await asyncio.sleep(1.0)
+            return httpx.Response(200, json={"from": "primary"})
+        return httpx.Response(200, json={"from": "secondary"})
+
+    monkeypatch.setattr(circuit_breaker, "HEDGE_DEFAULT_DELAY", 0.05)
+    upstream = _upstream(monkeypatch, handler, secondary_url="http://secondary/api")
+
+    resp = asyncio.run(upstream.get(params={"q": "ramen"}))
+
+    assert resp.json() == {"from": "secondary"}
+    assert hosts == ["primary", "secondary"]
+
+
+def test_failing_primary_falls_over_to_the_secondary_at_once(monkeypatch):
+    def handler(request):
+        if request.url.host == "primary":
+            return httpx.Response(502)
+        return httpx.Response(200, json={"from": "secondary"})
+
+    upstream = _upstream(monkeypatch, handler, secondary_url="http://secondary/api")
+
+    resp = asyncio.run(upstream.get())
+
+    assert resp.json() == {"from": "secondary"}
+
+
+def test_abandoned_slow_primary_still_counts_against_its_breaker(monkeypatch):
+    async def handler(request):
+        if request.url.host == "primary":
+            await asyncio.sleep(1.0)
+        return httpx.Response(200, json={})
+
+    monkeypatch.setattr(circuit_breaker, "HEDGE_DEFAULT_DELAY", 0.05)
+    upstream = _upstream(monkeypatch, handler, secondary_url="http://secondary/api", min_calls=2, window=2, slow_call_seconds=0.04)
+    breaker = circuit_breaker._breakers["photon"]
+
+    async def run():
+        for _ in range(2):
+            await upstream.get()
+            # Let the cancelled primary unwind
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    stats = breaker.stats()
+    assert stats["calls"] == 2
+    assert stats["slow_calls"] == 2
+    assert stats["state"] == "open"
+    assert min(breaker._latencies) >= 0.05